@@ -1,179 +1,609 @@
+import time
+STARTUP_STARTED = time.perf_counter()
+
 import sys
 import os
-import time
+import threading
+import multiprocessing
 from pathlib import Path
+from collections import deque, OrderedDict
 import qdarktheme
-from packaging import version
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                            QHBoxLayout, QLabel, QLineEdit, 
-                            QPushButton, QProgressBar, QFileDialog, QDialog, QDialogButtonBox)
-from PyQt6.QtCore import QThread, pyqtSignal, Qt, QSettings, QTimer, QUrl
-from PyQt6.QtGui import QIcon, QPixmap, QCursor, QDesktopServices
-import requests
-from mutagen.mp4 import MP4, MP4Cover
-
-DEFAULT_COOKIES = "PHPSESSID=qse7m9ski4k1sqiefelojpv5pq"
+                            QHBoxLayout, QLabel, QLineEdit, QSpinBox,
+                            QPushButton, QFileDialog, QDialog, QDialogButtonBox, QTableView,
+                            QHeaderView, QAbstractItemView, QStyledItemDelegate,
+                            QStyleOptionProgressBar, QStyle)
+from PyQt6.QtCore import (QObject, QThread, pyqtSignal, Qt, QSettings, QTimer, QUrl,
+                          QAbstractTableModel, QModelIndex)
+from PyQt6.QtGui import QIcon, QPixmap, QImage, QCursor, QDesktopServices
+from soundcloud_goplus import (DownloadTask, resolve_track, get_http_client, configure_http_client,
+                               get_collection_kind, get_soundcloud_api, get_track_title,
+                               close_http_client, get_artwork_cache, configure_artwork_cache,
+                               configure_track_info_cache, close_track_info_cache, JobMetrics,
+                               resolve_with_metrics, configure_metrics, close_metrics,
+                               get_library_index, close_library_index, configure_limits,
+                               get_bandwidth_limiter, UrlIngester, extract_soundcloud_urls,
+                               is_short_link, normalize_soundcloud_url, configure_postprocessor,
+                               close_postprocessor, format_file_size, resolve_short_link,
+                               configure_resolver, close_resolver, cover_resizing_available)
+from soundcloud_goplus.constants import (DEFAULT_COOKIES, DEFAULT_MAX_DOWNLOADS, MAX_DOWNLOADS_LIMIT,
+                                         DEFAULT_DOWNLOAD_SEGMENTS, MAX_DOWNLOAD_SEGMENTS,
+                                         HTTP_RETRIES, HTTP_POOL_MAXSIZE, ARTWORK_CACHE_MAX_MB,
+                                         TRACK_INFO_TTL, INGEST_BATCH_SIZE, POSTPROCESS_WORKERS,
+                                         SOUNDCLOUD_API_URL)
+
 WINDOW_WIDTH = 600
-WINDOW_HEIGHT = 180
+WINDOW_HEIGHT = 215
+QUEUE_HEIGHT = 200
 LABEL_WIDTH = 100
 BUTTON_WIDTH = 100
-REQUEST_TIMEOUT = 30
+COVER_PREVIEW_SIZE = 100
+MAX_SPEED_LIMIT_KBPS = 1024 * 1024
+PREVIEW_CACHE_SIZE = 64
+JOB_VIEW_REFRESH_MS = 100
+PREFETCH_DELAY_MS = 400
+PREFETCH_MAX_AGE = 120
+JOB_ROW_HEIGHT = 22
+SPEED_COLUMN_WIDTH = 80
+JOB_ID_ROLE = Qt.ItemDataRole.UserRole
+PROGRESS_ROLE = Qt.ItemDataRole.UserRole + 1
+VERSION_URL = "https://raw.githubusercontent.com/afkarxyz/SoundCloudGoPlusDownloader/refs/heads/main/version.json"
+RELEASES_URL = "https://github.com/afkarxyz/SoundCloudGoPlusDownloader/releases"
+UPDATE_CHECK_INTERVAL = 24 * 60 * 60
+
+JOB_QUEUED = "Queued"
+JOB_RUNNING = "Downloading"
+JOB_COMPLETED = "Completed"
+JOB_FAILED = "Failed"
+JOB_CANCELLED = "Cancelled"
+
+def load_preview_image(url, size=COVER_PREVIEW_SIZE):
+    data = get_artwork_cache().get(url)
+    if not data:
+        return None
+
+    image = QImage()
+    if not image.loadFromData(data):
+        return None
+    return image.scaled(
+        size, size,
+        Qt.AspectRatioMode.KeepAspectRatio,
+        Qt.TransformationMode.SmoothTransformation
+    )
 
 class TrackInfoFetcher(QThread):
     finished = pyqtSignal(dict)
+    url_resolved = pyqtSignal(str)
     error = pyqtSignal(str)
     
-    def __init__(self, url, cookies):
+    def __init__(self, url, cookies, use_cache=True):
         super().__init__()
         self.url = url
         self.cookies = cookies
+        self.use_cache = use_cache
                     
     def run(self):
         try:
-            headers = {
-                "Accept": "application/json, text/javascript, */*; q=0.01",
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36",
-                "Origin": "https://scloudplaylistdownloadermp3.com",
-                "Referer": "https://scloudplaylistdownloadermp3.com/",
-                "Cookie": self.cookies
-            }
-            
-            data = {"url": self.url}
-            response = requests.post(
-                "https://scloudplaylistdownloadermp3.com/api/scinfo.php", 
-                data=data, 
-                headers=headers,
-                timeout=REQUEST_TIMEOUT
-            )
-            response.raise_for_status()
-            result = response.json()
+            if is_short_link(self.url):
+                self.url = normalize_soundcloud_url(resolve_short_link(self.url))
+                self.url_resolved.emit(self.url)
+                if get_collection_kind(self.url):
+                    return
+            result = resolve_track(self.url, self.cookies, self.use_cache)
             self.finished.emit(result)
-        except requests.exceptions.RequestException as e:
-            self.error.emit(f"Network error: {str(e)}")
         except Exception as e:
             self.error.emit(str(e))
 
+class TrackPrefetcher(QThread):
+    prefetched = pyqtSignal(str, str, dict)
+    cover_loaded = pyqtSignal(str, QImage)
+
+    def __init__(self, url, cookies):
+        super().__init__()
+        self.url = url
+        self.cookies = cookies
+
+    def run(self):
+        try:
+            url = resolve_short_link(self.url) if is_short_link(self.url) else normalize_soundcloud_url(self.url)
+            if self.isInterruptionRequested():
+                return
+            if get_collection_kind(url):
+                get_http_client().prewarm(SOUNDCLOUD_API_URL)
+                return
+
+            info = resolve_track(url, self.cookies)
+            if self.isInterruptionRequested():
+                return
+            self.prefetched.emit(self.url, url, info)
+
+            if info.get('dlink_m4a'):
+                get_http_client().prewarm(info['dlink_m4a'])
+            if info.get('thumb') and not self.isInterruptionRequested():
+                image = load_preview_image(info['thumb'])
+                if image is not None:
+                    self.cover_loaded.emit(info['thumb'], image)
+        except Exception:
+            pass
+
+class PlaylistExpander(QThread):
+    track_found = pyqtSignal(dict)
+    finished = pyqtSignal(int)
+    error = pyqtSignal(str)
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+
+    def run(self):
+        count = 0
+        try:
+            for track in get_soundcloud_api().iter_tracks(self.url):
+                if self.isInterruptionRequested():
+                    break
+                if not track.get('permalink_url'):
+                    continue
+                artist, name = get_track_title(track)
+                self.track_found.emit({'url': track['permalink_url'], 'artist': artist, 'name': name})
+                count += 1
+            self.finished.emit(count)
+        except Exception as e:
+            self.error.emit(str(e))
+
+class UrlImporter(QThread):
+    tracks_found = pyqtSignal(list)
+    finished = pyqtSignal(int, int)
+    error = pyqtSignal(str)
+
+    def __init__(self, source=None, lines=None):
+        super().__init__()
+        self.source = source
+        self.lines = lines
+
+    def run(self):
+        ingester = UrlIngester()
+        batch = []
+        count = 0
+        try:
+            urls = ingester.feed(self.lines) if self.lines is not None else ingester.read(self.source)
+            for url in urls:
+                if self.isInterruptionRequested():
+                    break
+                for track in self._expand(url, ingester):
+                    batch.append(track)
+                    count += 1
+                    if len(batch) >= INGEST_BATCH_SIZE:
+                        self.tracks_found.emit(batch)
+                        batch = []
+            if batch:
+                self.tracks_found.emit(batch)
+            self.finished.emit(count, ingester.duplicates)
+        except Exception as e:
+            self.error.emit(str(e))
+        finally:
+            ingester.close()
+
+    def _expand(self, url, ingester):
+        if not get_collection_kind(url):
+            yield {'url': url}
+            return
+
+        try:
+            for track in get_soundcloud_api().iter_tracks(url):
+                if self.isInterruptionRequested():
+                    return
+                if not track.get('permalink_url'):
+                    continue
+                track_url = normalize_soundcloud_url(track['permalink_url'])
+                if ingester.seen.add(track_url):
+                    artist, name = get_track_title(track)
+                    yield {'url': track_url, 'artist': artist, 'name': name}
+        except Exception:
+            ingester.rejected += 1
+
 class DownloaderWorker(QThread):
     progress = pyqtSignal(int)
     progress_status = pyqtSignal(str)
+    speed = pyqtSignal(float)
+    resolved = pyqtSignal(dict)
     finished = pyqtSignal(str)
     error = pyqtSignal(str)
 
-    def __init__(self, track_info, output_dir):
+    def __init__(self, track_info, output_dir, job_id=None, segments=DEFAULT_DOWNLOAD_SEGMENTS,
+                 url=None, cookies=DEFAULT_COOKIES):
         super().__init__()
         self.track_info = track_info
         self.output_dir = output_dir
+        self.job_id = job_id
+        self.segments = segments
+        self.url = url
+        self.cookies = cookies
 
-    def _create_safe_filename(self, track_info):
-        artist = track_info.get('artist', 'Unknown')
-        name = track_info.get('name', 'Unknown')
-        filename = f"{artist} - {name}.m4a"
-        return "".join(c for c in filename if c.isalnum() or c in (' ', '-', '_', '.')).rstrip()
-
-    def _format_file_size(self, size_bytes):
-        if size_bytes == 0:
-            return "0B"
-        size_names = ["B", "KB", "MB", "GB"]
-        i = 0
-        while size_bytes >= 1024 and i < len(size_names) - 1:
-            size_bytes /= 1024.0
-            i += 1
-        return f"{size_bytes:.1f}{size_names[i]}"
-
-    def _download_file(self, url, filepath):
+    def run(self):
         try:
-            response = requests.get(url, stream=True, timeout=REQUEST_TIMEOUT)
-            response.raise_for_status()
-            
-            file_size = int(response.headers.get('content-length', 0))
-            downloaded = 0
-            start_time = time.time()
-            last_time = start_time
-            last_downloaded = 0
-            
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        current_time = time.time()
-                        
-                        if current_time - last_time >= 0.5 or downloaded == file_size:
-                            if file_size > 0:
-                                progress = 10 + int((downloaded / file_size) * 70)
-                                self.progress.emit(progress)
-                                
-                                time_diff = current_time - last_time
-                                if time_diff > 0:
-                                    bytes_diff = downloaded - last_downloaded
-                                    speed_bps = bytes_diff / time_diff
-                                    speed_str = f"{self._format_file_size(speed_bps)}/s"
-                                    
-                                    downloaded_str = self._format_file_size(downloaded)
-                                    total_str = self._format_file_size(file_size)
-                                    status = f"Downloading... {downloaded_str} / {total_str} ({speed_str})"
-                                    self.progress_status.emit(status)
-                                    
-                                    last_time = current_time
-                                    last_downloaded = downloaded
-            
-            return True
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Download failed: {str(e)}")
+            existing = get_library_index().get(self.url) if self.url else None
+            if existing:
+                self.progress.emit(100)
+                self.progress_status.emit("Already downloaded")
+                self.finished.emit(f"Already downloaded: {os.path.basename(existing['filepath'])}")
+                return
 
-    def _add_metadata(self, filepath, track_info):
-        try:
-            audio = MP4(filepath)
-            
-            if track_info.get('artist'):
-                audio['\xa9ART'] = [track_info['artist']]
-            if track_info.get('date'):
-                audio['\xa9day'] = [track_info['date']]
-            
-            self.progress.emit(90)
-            
-            if track_info.get('thumb'):
-                try:
-                    thumb_response = requests.get(track_info['thumb'], timeout=REQUEST_TIMEOUT)
-                    thumb_response.raise_for_status()
-                    thumb_data = thumb_response.content
-                    
-                    if thumb_data:
-                        cover_format = MP4Cover.FORMAT_JPEG if thumb_data.startswith(b'\xff\xd8') else MP4Cover.FORMAT_PNG
-                        audio['covr'] = [MP4Cover(thumb_data, imageformat=cover_format)]
-                except requests.exceptions.RequestException:
-                    pass
-            
-            audio.save()
+            metrics = JobMetrics(self.url)
+            if not self.track_info.get('dlink_m4a') and self.url:
+                self.progress_status.emit("Fetching track information...")
+                self.track_info, metrics = resolve_with_metrics(self.url, self.cookies, metrics=metrics)
+                self.resolved.emit(self.track_info)
+
+            task = DownloadTask(
+                self.track_info,
+                self.output_dir,
+                segments=self.segments,
+                on_progress=self.progress.emit,
+                on_status=self.progress_status.emit,
+                on_speed=self.speed.emit,
+                is_cancelled=self.isInterruptionRequested,
+                metrics=metrics,
+                url=self.url,
+                cookies=self.cookies,
+                on_resolved=self.resolved.emit
+            )
+            filepath = task.run()
+            self.finished.emit(f"Downloaded: {os.path.basename(filepath)}")
             
         except Exception as e:
-            raise Exception(f"Failed to add metadata: {str(e)}")
+            self.error.emit(f"Error: {str(e)}")
+
+class ArtworkLoader(QThread):
+    loaded = pyqtSignal(str, QImage)
+
+    def __init__(self, url, size=COVER_PREVIEW_SIZE):
+        super().__init__()
+        self.url = url
+        self.size = size
+
+    def run(self):
+        image = load_preview_image(self.url, self.size)
+        if image is not None and not self.isInterruptionRequested():
+            self.loaded.emit(self.url, image)
+
+class DownloadJob:
+    def __init__(self, job_id, track_info, output_dir, url=None, cookies=DEFAULT_COOKIES):
+        self.job_id = job_id
+        self.track_info = track_info
+        self.output_dir = output_dir
+        self.url = url
+        self.cookies = cookies
+        self.state = JOB_QUEUED
+        self.progress = 0
+        self.speed = 0.0
+        self.status = "Waiting..."
+        self.worker = None
+
+    @property
+    def title(self):
+        if not self.track_info.get('name') and self.url:
+            return self.url
+        artist = self.track_info.get('artist', 'Unknown')
+        name = self.track_info.get('name', 'Unknown')
+        return f"{artist} - {name}"
+
+    @property
+    def is_active(self):
+        return self.state in (JOB_QUEUED, JOB_RUNNING)
+
+class DownloadQueue(QObject):
+    job_added = pyqtSignal(int)
+    job_updated = pyqtSignal(int)
+    job_removed = pyqtSignal(int)
+    idle = pyqtSignal()
+
+    def __init__(self, max_workers=DEFAULT_MAX_DOWNLOADS, parent=None):
+        super().__init__(parent)
+        self.max_workers = max(1, max_workers)
+        self.segments = DEFAULT_DOWNLOAD_SEGMENTS
+        self.jobs = {}
+        self.pending = deque()
+        self.running = {}
+        self._next_job_id = 1
+
+    def set_max_workers(self, max_workers):
+        self.max_workers = max(1, min(max_workers, MAX_DOWNLOADS_LIMIT))
+        self._schedule()
+
+    def set_segments(self, segments):
+        self.segments = max(1, min(segments, MAX_DOWNLOAD_SEGMENTS))
+
+    def enqueue(self, track_info, output_dir, url=None, cookies=DEFAULT_COOKIES):
+        job = DownloadJob(self._next_job_id, dict(track_info), output_dir, url, cookies)
+        self._next_job_id += 1
+        self.jobs[job.job_id] = job
+        self.pending.append(job.job_id)
+        self.job_added.emit(job.job_id)
+        self._schedule()
+        return job.job_id
+
+    def retry(self, job_id):
+        job = self.jobs.get(job_id)
+        if not job or job.is_active:
+            return False
+        job.state = JOB_QUEUED
+        job.progress = 0
+        job.status = "Waiting..."
+        self.pending.append(job_id)
+        self.job_updated.emit(job_id)
+        self._schedule()
+        return True
+
+    def retry_failed(self):
+        for job_id, job in list(self.jobs.items()):
+            if job.state in (JOB_FAILED, JOB_CANCELLED):
+                self.retry(job_id)
+
+    def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if not job or not job.is_active:
+            return False
+        if job.state == JOB_QUEUED:
+            self.pending.remove(job_id)
+            self._set_final_state(job, JOB_CANCELLED, "Cancelled")
+            self._check_idle()
+        else:
+            job.status = "Cancelling..."
+            job.worker.requestInterruption()
+            self.job_updated.emit(job_id)
+        return True
+
+    def cancel_all(self):
+        pending = list(self.pending)
+        self.pending.clear()
+        for job_id in pending:
+            self._set_final_state(self.jobs[job_id], JOB_CANCELLED, "Cancelled")
+        for job_id in list(self.running):
+            self.cancel(job_id)
+        self._check_idle()
+
+    def clear_finished(self):
+        for job_id, job in list(self.jobs.items()):
+            if not job.is_active:
+                del self.jobs[job_id]
+                self.job_removed.emit(job_id)
+
+    def active_count(self):
+        return len(self.pending) + len(self.running)
+
+    def shutdown(self):
+        self.pending.clear()
+        for worker in list(self.running.values()):
+            worker.requestInterruption()
+        for worker in list(self.running.values()):
+            worker.quit()
+            worker.wait()
+
+    def _schedule(self):
+        while self.pending and len(self.running) < self.max_workers:
+            self._start_job(self.jobs[self.pending.popleft()])
+
+    def _start_job(self, job):
+        worker = DownloaderWorker(job.track_info, job.output_dir, job.job_id, self.segments,
+                                  job.url, job.cookies)
+        worker.progress.connect(self._on_progress)
+        worker.resolved.connect(self._on_resolved)
+        worker.progress_status.connect(self._on_progress_status)
+        worker.speed.connect(self._on_speed)
+        worker.finished.connect(self._on_finished)
+        worker.error.connect(self._on_error)
+        job.worker = worker
+        job.state = JOB_RUNNING
+        job.status = "Starting..."
+        self.running[job.job_id] = worker
+        self.job_updated.emit(job.job_id)
+        worker.start()
+
+    def _job_for_sender(self):
+        worker = self.sender()
+        return self.jobs.get(worker.job_id) if worker else None
+
+    def _on_progress(self, value):
+        job = self._job_for_sender()
+        if job and job.state == JOB_RUNNING:
+            job.progress = value
+            self.job_updated.emit(job.job_id)
+
+    def _on_resolved(self, track_info):
+        job = self._job_for_sender()
+        if job:
+            job.track_info = track_info
+            self.job_updated.emit(job.job_id)
+
+    def _on_progress_status(self, status):
+        job = self._job_for_sender()
+        if job and job.state == JOB_RUNNING and not job.worker.isInterruptionRequested():
+            job.status = status
+            self.job_updated.emit(job.job_id)
+
+    def _on_speed(self, value):
+        job = self._job_for_sender()
+        if job and job.state == JOB_RUNNING:
+            job.speed = value
+            self.job_updated.emit(job.job_id)
+
+    def _on_finished(self, message):
+        job = self._job_for_sender()
+        if job:
+            job.progress = 100
+            self._set_final_state(job, JOB_COMPLETED, message)
+        self._release_worker(self.sender())
+
+    def _on_error(self, error_message):
+        job = self._job_for_sender()
+        if job:
+            if job.worker.isInterruptionRequested():
+                self._set_final_state(job, JOB_CANCELLED, "Cancelled")
+            else:
+                self._set_final_state(job, JOB_FAILED, error_message)
+        self._release_worker(self.sender())
+
+    def _set_final_state(self, job, state, status):
+        job.state = state
+        job.status = status
+        job.speed = 0.0
+        self.job_updated.emit(job.job_id)
+
+    def _release_worker(self, worker):
+        self.running.pop(worker.job_id, None)
+        job = self.jobs.get(worker.job_id)
+        if job and job.worker is worker:
+            job.worker = None
+        worker.wait()
+        worker.deleteLater()
+        self._schedule()
+        self._check_idle()
+
+    def _check_idle(self):
+        if not self.pending and not self.running:
+            self.idle.emit()
+
+class JobTableModel(QAbstractTableModel):
+    COLUMNS = ("Track", "Progress", "Speed", "Status")
+    summary_changed = pyqtSignal()
+
+    def __init__(self, download_queue, parent=None):
+        super().__init__(parent)
+        self.download_queue = download_queue
+        self.job_ids = []
+        self.rows = {}
+        self._states = {}
+        self._added = []
+        self._removed = set()
+        self._dirty = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(JOB_VIEW_REFRESH_MS)
+        self._timer.timeout.connect(self.flush)
+        download_queue.job_added.connect(self._on_job_added)
+        download_queue.job_updated.connect(self._on_job_updated)
+        download_queue.job_removed.connect(self._on_job_removed)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.job_ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        job = self.download_queue.jobs.get(self.job_ids[index.row()])
+        if job is None:
+            return None
+
+        column = index.column()
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            if column == 0:
+                return job.title
+            if column == 1:
+                return f"{job.progress}%"
+            if column == 2:
+                if job.state == JOB_RUNNING and job.speed > 0:
+                    return f"{format_file_size(job.speed)}/s"
+                return ""
+            return job.status
+        if role == JOB_ID_ROLE:
+            return job.job_id
+        if role == PROGRESS_ROLE:
+            return job.progress
+        return None
+
+    def job_id_at(self, row):
+        return self.job_ids[row]
+
+    def _schedule(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _on_job_added(self, job_id):
+        self._added.append(job_id)
+        self._schedule()
+
+    def _on_job_updated(self, job_id):
+        self._dirty.add(job_id)
+        self._schedule()
+
+    def _on_job_removed(self, job_id):
+        self._removed.add(job_id)
+        self._schedule()
+
+    def flush(self):
+        jobs = self.download_queue.jobs
+        changed = bool(self._added or self._removed)
+        if self._removed:
+            self.beginResetModel()
+            self.job_ids = [job_id for job_id in self.job_ids + self._added
+                            if job_id in jobs and job_id not in self._removed]
+            self.rows = {job_id: row for row, job_id in enumerate(self.job_ids)}
+            for job_id in self._removed:
+                self._states.pop(job_id, None)
+            self.endResetModel()
+        elif self._added:
+            first = len(self.job_ids)
+            self.beginInsertRows(QModelIndex(), first, first + len(self._added) - 1)
+            for job_id in self._added:
+                self.rows[job_id] = len(self.job_ids)
+                self.job_ids.append(job_id)
+            self.endInsertRows()
+        self._added = []
+        self._removed = set()
+
+        rows = []
+        for job_id in self._dirty:
+            row = self.rows.get(job_id)
+            job = jobs.get(job_id)
+            if row is None or job is None:
+                continue
+            rows.append(row)
+            if self._states.get(job_id) != job.state:
+                self._states[job_id] = job.state
+                changed = True
+        self._dirty = set()
+
+        if rows:
+            self.dataChanged.emit(self.index(min(rows), 0),
+                                  self.index(max(rows), len(self.COLUMNS) - 1))
+        if changed:
+            self.summary_changed.emit()
+
+class ProgressDelegate(QStyledItemDelegate):
+    def paint(self, painter, option, index):
+        progress = QStyleOptionProgressBar()
+        progress.rect = option.rect.adjusted(2, 2, -2, -2)
+        progress.minimum = 0
+        progress.maximum = 100
+        progress.progress = index.data(PROGRESS_ROLE) or 0
+        progress.text = f"{progress.progress}%"
+        progress.textVisible = True
+        progress.state = option.state | QStyle.StateFlag.State_Horizontal
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ProgressBar, progress, painter, option.widget)
+
+class UpdateChecker(QObject):
+    checked = pyqtSignal(str)
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
 
     def run(self):
         try:
-            os.makedirs(self.output_dir, exist_ok=True)
-            
-            filename = self._create_safe_filename(self.track_info)
-            filepath = os.path.join(self.output_dir, filename)
-            
-            self.progress.emit(10)
-            self.progress_status.emit("Preparing download...")
-            
-            if not self.track_info.get('dlink_m4a'):
-                raise Exception("No download link available")
-                
-            self._download_file(self.track_info['dlink_m4a'], filepath)
-            self.progress.emit(80)
-            self.progress_status.emit("Adding metadata...")
-            
-            self._add_metadata(filepath, self.track_info)
-            self.progress.emit(100)
-            self.progress_status.emit("Download completed!")
-            
-            self.finished.emit(f"Downloaded: {os.path.basename(filepath)}")
-            
+            response = get_http_client().get(VERSION_URL, timeout=10)
+            response.raise_for_status()
+            self.checked.emit(response.json().get("version") or "")
         except Exception as e:
-            self.error.emit(f"Error: {str(e)}")
+            print(f"Error checking for updates: {e}")
+            self.checked.emit("")
 
 class UpdateDialog(QDialog):
     def __init__(self, current_version, new_version, parent=None):
@@ -209,39 +639,108 @@ class SoundCloudGoPlusDownloaderGUI(QMainWindow):
         super().__init__()
         self.current_version = "1.1"
         self.settings = QSettings('SoundCloudGoPlusDownloader', 'Settings')
+        max_downloads = self.settings.value('max_downloads', DEFAULT_MAX_DOWNLOADS, type=int)
+        download_segments = self.settings.value('download_segments', DEFAULT_DOWNLOAD_SEGMENTS, type=int)
+        configure_http_client(
+            retries=self.settings.value('http_retries', HTTP_RETRIES, type=int),
+            pool_maxsize=max(HTTP_POOL_MAXSIZE, max_downloads * download_segments)
+        )
+        configure_artwork_cache(
+            max_bytes=self.settings.value('artwork_cache_mb', ARTWORK_CACHE_MAX_MB, type=int) * 1024 * 1024
+        )
+        configure_track_info_cache(
+            ttl=self.settings.value('track_info_ttl', TRACK_INFO_TTL, type=int)
+        )
+        configure_limits(
+            bandwidth=self.settings.value('bandwidth_limit_kbps', 0, type=int) * 1024,
+            host_connections=self.settings.value('host_connections', 0, type=int),
+            host_rate=self.settings.value('host_requests_per_second', 0.0, type=float)
+        )
+        configure_metrics(
+            jsonl_path=self.settings.value('metrics_log', '', type=str) or None,
+            prometheus_path=self.settings.value('metrics_file', '', type=str) or None
+        )
+        max_cover_size = self.settings.value('cover_max_size', 0, type=int)
+        self.cover_resize_disabled = bool(max_cover_size) and not cover_resizing_available()
+        configure_postprocessor(
+            workers=self.settings.value('postprocess_workers', POSTPROCESS_WORKERS, type=int),
+            max_cover_size=0 if self.cover_resize_disabled else max_cover_size,
+            extra_tags=self.settings.value('extra_tags', False, type=bool)
+        )
+        configure_resolver(
+            endpoints=self.settings.value('resolver_endpoints', '', type=str).split() or None,
+            hedge=self.settings.value('resolve_hedging', True, type=bool)
+        )
         self.setWindowTitle("SoundCloud Go+ Downloader")
         
         self._setup_window()
         self._setup_default_dir()
         
         self.track_info = None
+        self.track_url = None
         self.fetcher = None
-        self.worker = None
+        self.expander = None
+        self.importer = None
+        self.prefetcher = None
+        self.prefetchers = set()
+        self.prefetched = None
+        self.fetch_waiting = False
+        self.speculative_prefetch = self.settings.value('speculative_prefetch', True, type=bool)
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(PREFETCH_DELAY_MS)
+        self.prefetch_timer.timeout.connect(self.start_prefetch)
+        self.update_checker = None
+        self.cover_url = None
+        self.preview_cache = OrderedDict()
+        self.artwork_loaders = set()
+        self.download_queue = DownloadQueue(max_downloads, self)
+        self.download_queue.set_segments(download_segments)
+        self.job_model = JobTableModel(self.download_queue, self)
         
         self.init_ui()
         self._connect_signals()
         self.load_settings()
+        if self.cover_resize_disabled:
+            self.status_label.setText("Cover resizing is off because Pillow is not installed")
         
         self.check_for_updates = self.settings.value('check_for_updates', True, type=bool)
         if self.check_for_updates:
             QTimer.singleShot(0, self.check_updates)
 
     def check_updates(self):
+        last_checked = self.settings.value('update_last_checked', 0.0, type=float)
+        if time.time() - last_checked < UPDATE_CHECK_INTERVAL:
+            self.show_update_dialog(self.settings.value('update_latest_version', '', type=str))
+            return
+
+        self.settings.setValue('update_last_checked', time.time())
+        self.update_checker = UpdateChecker(self)
+        self.update_checker.checked.connect(self.handle_update_check)
+        self.update_checker.start()
+
+    def handle_update_check(self, new_version):
+        if new_version:
+            self.settings.setValue('update_latest_version', new_version)
+        self.show_update_dialog(new_version)
+
+    def show_update_dialog(self, new_version):
+        if not new_version:
+            return
+
+        from packaging import version
+
         try:
-            response = requests.get("https://raw.githubusercontent.com/afkarxyz/SoundCloudGoPlusDownloader/refs/heads/main/version.json", timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                new_version = data.get("version")
-                
-                if new_version and version.parse(new_version) > version.parse(self.current_version):
-                    dialog = UpdateDialog(self.current_version, new_version, self)
-                    result = dialog.exec()
-                    
-                    if result == QDialog.DialogCode.Accepted:
-                        QDesktopServices.openUrl(QUrl("https://github.com/afkarxyz/SoundCloudGoPlusDownloader/releases"))
-                        
-        except Exception as e:
-            print(f"Error checking for updates: {e}")
+            if version.parse(new_version) <= version.parse(self.current_version):
+                return
+        except version.InvalidVersion:
+            return
+
+        dialog = UpdateDialog(self.current_version, new_version, self)
+        result = dialog.exec()
+
+        if result == QDialog.DialogCode.Accepted:
+            QDesktopServices.openUrl(QUrl(RELEASES_URL))
         
     def _setup_window(self):
         icon_path = os.path.join(os.path.dirname(__file__), "icon.svg")
@@ -262,6 +761,11 @@ class SoundCloudGoPlusDownloaderGUI(QMainWindow):
             lambda x: self.settings.setValue('cookies', x))
         self.dir_input.textChanged.connect(
             lambda x: self.settings.setValue('output_dir', x))
+        self.max_downloads_input.valueChanged.connect(self.set_max_downloads)
+        self.segments_input.valueChanged.connect(self.set_download_segments)
+        self.speed_limit_input.valueChanged.connect(self.set_speed_limit)
+        self.job_model.summary_changed.connect(self.refresh_queue_view)
+        self.download_queue.idle.connect(self.update_queue_summary)
         
     def load_settings(self):
         cookies = self.settings.value('cookies', DEFAULT_COOKIES)
@@ -269,6 +773,9 @@ class SoundCloudGoPlusDownloaderGUI(QMainWindow):
         
         self.cookies_input.setText(cookies)
         self.dir_input.setText(output_dir)
+        self.max_downloads_input.setValue(self.download_queue.max_workers)
+        self.segments_input.setValue(self.download_queue.segments)
+        self.speed_limit_input.setValue(self.settings.value('bandwidth_limit_kbps', 0, type=int))
 
     def _create_input_section(self):
         self.input_widget = QWidget()
@@ -288,10 +795,17 @@ class SoundCloudGoPlusDownloaderGUI(QMainWindow):
         self.fetch_button.setFixedWidth(BUTTON_WIDTH)
         self.fetch_button.setEnabled(False)
         self.fetch_button.clicked.connect(self.fetch_track_info)
+
+        self.import_button = QPushButton("Import")
+        self.import_button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self.import_button.setFixedWidth(BUTTON_WIDTH)
+        self.import_button.setToolTip("Queue every SoundCloud URL in a text or CSV file")
+        self.import_button.clicked.connect(self.select_import_file)
         
         url_layout.addWidget(url_label)
         url_layout.addWidget(self.url_input)
         url_layout.addWidget(self.fetch_button)
+        url_layout.addWidget(self.import_button)
         input_layout.addLayout(url_layout)
 
         dir_layout = QHBoxLayout()
@@ -316,6 +830,7 @@ class SoundCloudGoPlusDownloaderGUI(QMainWindow):
         self.cookies_input.setPlaceholderText(DEFAULT_COOKIES)
         self.cookies_input.setText(DEFAULT_COOKIES)
         self.cookies_input.setClearButtonEnabled(True)
+        self.cookies_input.setToolTip("Separate several sessions with | to spread track lookups across them")
         
         self.reset_cookies_button = QPushButton("Reset")
         self.reset_cookies_button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
@@ -326,6 +841,44 @@ class SoundCloudGoPlusDownloaderGUI(QMainWindow):
         cookies_layout.addWidget(self.cookies_input)
         cookies_layout.addWidget(self.reset_cookies_button)
         input_layout.addLayout(cookies_layout)
+
+        max_downloads_layout = QHBoxLayout()
+        max_downloads_label = QLabel("Max Downloads:")
+        max_downloads_label.setFixedWidth(LABEL_WIDTH)
+
+        self.max_downloads_input = QSpinBox()
+        self.max_downloads_input.setRange(1, MAX_DOWNLOADS_LIMIT)
+        self.max_downloads_input.setValue(DEFAULT_MAX_DOWNLOADS)
+        self.max_downloads_input.setFixedWidth(BUTTON_WIDTH)
+
+        max_downloads_layout.addWidget(max_downloads_label)
+        max_downloads_layout.addWidget(self.max_downloads_input)
+        max_downloads_layout.addSpacing(15)
+
+        segments_label = QLabel("Connections:")
+        segments_label.setFixedWidth(LABEL_WIDTH)
+
+        self.segments_input = QSpinBox()
+        self.segments_input.setRange(1, MAX_DOWNLOAD_SEGMENTS)
+        self.segments_input.setValue(DEFAULT_DOWNLOAD_SEGMENTS)
+        self.segments_input.setFixedWidth(BUTTON_WIDTH)
+        self.segments_input.setToolTip("Parallel connections per download when the server supports ranges")
+
+        max_downloads_layout.addWidget(segments_label)
+        max_downloads_layout.addWidget(self.segments_input)
+        max_downloads_layout.addSpacing(15)
+
+        self.speed_limit_input = QSpinBox()
+        self.speed_limit_input.setRange(0, MAX_SPEED_LIMIT_KBPS)
+        self.speed_limit_input.setSingleStep(256)
+        self.speed_limit_input.setSuffix(" KB/s")
+        self.speed_limit_input.setSpecialValueText("No limit")
+        self.speed_limit_input.setFixedWidth(BUTTON_WIDTH)
+        self.speed_limit_input.setToolTip("Total download speed shared by all downloads")
+
+        max_downloads_layout.addWidget(self.speed_limit_input)
+        max_downloads_layout.addStretch()
+        input_layout.addLayout(max_downloads_layout)
         
         input_layout.addStretch()
         return self.input_widget
@@ -381,9 +934,8 @@ class SoundCloudGoPlusDownloaderGUI(QMainWindow):
 
     def _create_control_buttons(self):
         button_configs = [
-            ('download_button', 'Download', self.button_clicked),
-            ('cancel_button', 'Cancel', self.cancel_clicked),
-            ('open_button', 'Open', self.open_output_directory)
+            ('download_button', 'Download', self.start_download),
+            ('cancel_button', 'Cancel', self.cancel_clicked)
         ]
         
         for attr_name, text, handler in button_configs:
@@ -396,13 +948,58 @@ class SoundCloudGoPlusDownloaderGUI(QMainWindow):
 
         download_layout = QHBoxLayout()
         download_layout.addStretch()
-        download_layout.addWidget(self.open_button)
         download_layout.addWidget(self.download_button)
         download_layout.addWidget(self.cancel_button)
         download_layout.addStretch()
         
         return download_layout
 
+    def _create_queue_section(self):
+        self.queue_widget = QWidget()
+        self.queue_widget.hide()
+        queue_layout = QVBoxLayout(self.queue_widget)
+        queue_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.queue_table = QTableView()
+        self.queue_table.setModel(self.job_model)
+        self.queue_table.setItemDelegateForColumn(1, ProgressDelegate(self.queue_table))
+        self.queue_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.queue_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.queue_table.setWordWrap(False)
+        vertical_header = self.queue_table.verticalHeader()
+        vertical_header.hide()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(JOB_ROW_HEIGHT)
+        header = self.queue_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Fixed)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed)
+        header.setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        self.queue_table.setColumnWidth(1, BUTTON_WIDTH)
+        self.queue_table.setColumnWidth(2, SPEED_COLUMN_WIDTH)
+        queue_layout.addWidget(self.queue_table)
+
+        button_configs = [
+            ('open_button', 'Open', self.open_output_directory),
+            ('cancel_jobs_button', 'Cancel', self.cancel_selected_jobs),
+            ('retry_jobs_button', 'Retry Failed', self.download_queue.retry_failed),
+            ('clear_jobs_button', 'Clear Finished', self.download_queue.clear_finished)
+        ]
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch()
+        for attr_name, text, handler in button_configs:
+            button = QPushButton(text)
+            button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+            button.setFixedWidth(BUTTON_WIDTH)
+            button.clicked.connect(handler)
+            setattr(self, attr_name, button)
+            buttons_layout.addWidget(button)
+        buttons_layout.addStretch()
+        queue_layout.addLayout(buttons_layout)
+
+        return self.queue_widget
+
     def init_ui(self):
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -412,60 +1009,204 @@ class SoundCloudGoPlusDownloaderGUI(QMainWindow):
         self.main_layout.addWidget(self._create_input_section())
         self.main_layout.addWidget(self._create_track_display_section())
         self.main_layout.addLayout(self._create_control_buttons())
-
-        self.progress_bar = QProgressBar()
-        self.progress_bar.hide()
-        self.main_layout.addWidget(self.progress_bar)
+        self.main_layout.addWidget(self._create_queue_section())
 
         self.status_label = QLabel("")
         self.main_layout.addWidget(self.status_label)
 
     def _reset_ui_state(self):
-        self.progress_bar.hide()
-        self.progress_bar.setValue(0)
         self.download_button.hide()
         self.cancel_button.hide()
-        self.open_button.hide()
         self.track_widget.hide()
         self.input_widget.show()
         self.fetch_button.setEnabled(True)
-        self.setFixedHeight(WINDOW_HEIGHT)
+        self._update_window_height()
+
+    def _update_window_height(self):
+        if self.queue_widget.isHidden():
+            self.setFixedHeight(WINDOW_HEIGHT)
+        else:
+            self.setFixedHeight(WINDOW_HEIGHT + QUEUE_HEIGHT)
 
     def validate_url(self, url):
         url = url.strip()
         
         self.fetch_button.setEnabled(False)
+        self.cancel_prefetch()
         
         if not url:
             self.status_label.clear()
             return
             
-        if "soundcloud.com/" not in url:
+        urls = extract_soundcloud_urls(url)
+        if not urls:
             self.status_label.setText("Please enter a valid SoundCloud URL")
             return
             
         self.fetch_button.setEnabled(True)
         self.status_label.clear()
+        if self.speculative_prefetch and len(urls) == 1:
+            self.prefetch_timer.start()
+
+    def cancel_prefetch(self):
+        self.prefetch_timer.stop()
+        self.fetch_waiting = False
+        if self.prefetcher:
+            self.prefetcher.requestInterruption()
+            self.prefetcher = None
+
+    def start_prefetch(self):
+        urls = extract_soundcloud_urls(self.url_input.text())
+        if len(urls) != 1 or self._get_prefetched(urls[0]):
+            return
+
+        prefetcher = TrackPrefetcher(urls[0], self.cookies_input.text().strip())
+        prefetcher.prefetched.connect(self.handle_prefetched)
+        prefetcher.cover_loaded.connect(self.handle_cover_art)
+        prefetcher.finished.connect(lambda: self._release_prefetcher(prefetcher))
+        self.prefetchers.add(prefetcher)
+        self.prefetcher = prefetcher
+        prefetcher.start()
+
+    def _get_prefetched(self, url):
+        if not self.prefetched:
+            return None
+        prefetched_url, track_url, info, fetched_at = self.prefetched
+        if prefetched_url != url or time.monotonic() - fetched_at > PREFETCH_MAX_AGE:
+            return None
+        return track_url, info
+
+    def handle_prefetched(self, url, track_url, info):
+        if self.sender() is not self.prefetcher:
+            return
+        self.prefetched = (url, track_url, info, time.monotonic())
+        if self.fetch_waiting:
+            self.fetch_waiting = False
+            self.track_url = track_url
+            self.handle_track_info(info)
+
+    def _release_prefetcher(self, prefetcher):
+        self.prefetchers.discard(prefetcher)
+        prefetcher.deleteLater()
+        if self.prefetcher is prefetcher:
+            self.prefetcher = None
+            if self.fetch_waiting:
+                self.fetch_waiting = False
+                self.fetch_track_info()
 
     def fetch_track_info(self):
-        url = self.url_input.text().strip()
+        urls = extract_soundcloud_urls(self.url_input.text())
         cookies = self.cookies_input.text().strip()
         
-        if not url:
+        if not urls:
             self.status_label.setText("Please enter a SoundCloud URL")
             return
 
+        if len(urls) > 1:
+            self.import_urls(lines=urls)
+            self.url_input.clear()
+            return
+
+        prefetched = self._get_prefetched(urls[0])
+        if prefetched:
+            self.track_url, info = prefetched
+            self.handle_track_info(info)
+            return
+
         self.fetch_button.setEnabled(False)
+        if self.prefetcher and self.prefetcher.url == urls[0]:
+            self.status_label.setText("Fetching track information...")
+            self.fetch_waiting = True
+            return
+
+        url = urls[0] if is_short_link(urls[0]) else normalize_soundcloud_url(urls[0])
+
+        if get_collection_kind(url):
+            self.expand_playlist(url, cookies)
+            return
+
         self.status_label.setText("Fetching track information...")
         
         if self.fetcher:
             self.fetcher.deleteLater()
             
+        self.track_url = url
         self.fetcher = TrackInfoFetcher(url, cookies)
+        self.fetcher.url_resolved.connect(lambda track_url: self.handle_url_resolved(track_url, cookies))
         self.fetcher.finished.connect(self.handle_track_info)
         self.fetcher.error.connect(self.handle_fetch_error)
         self.fetcher.start()
 
+    def handle_url_resolved(self, url, cookies):
+        self.track_url = url
+        if get_collection_kind(url):
+            self.expand_playlist(url, cookies)
+
+    def expand_playlist(self, url, cookies):
+        output_dir = self.dir_input.text().strip() or self.default_music_dir
+        self.status_label.setText("Fetching playlist tracks...")
+
+        if self.expander:
+            self.expander.requestInterruption()
+            self.expander.wait()
+            self.expander.deleteLater()
+
+        self.expander = PlaylistExpander(url)
+        self.expander.track_found.connect(
+            lambda info: self.download_queue.enqueue(info, output_dir, info['url'], cookies))
+        self.expander.finished.connect(self.handle_playlist_expanded)
+        self.expander.error.connect(self.handle_fetch_error)
+        self.expander.start()
+
+    def handle_playlist_expanded(self, count):
+        self.url_input.clear()
+        self.fetch_button.setEnabled(True)
+        if count == 0:
+            self.status_label.setText("No downloadable tracks found")
+        else:
+            self.update_queue_summary()
+
+    def select_import_file(self):
+        source, _ = QFileDialog.getOpenFileName(self, "Import URLs", "",
+                                                "URL lists (*.txt *.csv);;All files (*)")
+        if source:
+            self.import_urls(source=source)
+
+    def import_urls(self, source=None, lines=None):
+        output_dir = self.dir_input.text().strip() or self.default_music_dir
+        cookies = self.cookies_input.text().strip()
+        self.status_label.setText("Importing URLs...")
+        self.import_button.setEnabled(False)
+
+        if self.importer:
+            self.importer.requestInterruption()
+            self.importer.wait()
+            self.importer.deleteLater()
+
+        def enqueue_tracks(tracks):
+            for info in tracks:
+                self.download_queue.enqueue(info, output_dir, info['url'], cookies)
+
+        self.importer = UrlImporter(source, lines)
+        self.importer.tracks_found.connect(enqueue_tracks)
+        self.importer.finished.connect(self.handle_import_finished)
+        self.importer.error.connect(self.handle_import_error)
+        self.importer.start()
+
+    def handle_import_finished(self, count, duplicates):
+        self.import_button.setEnabled(True)
+        if count == 0:
+            self.status_label.setText("No new SoundCloud URLs found")
+            return
+        self.update_queue_summary()
+        if duplicates:
+            self.status_label.setText(
+                f"{self.status_label.text()} ({duplicates} duplicate URLs skipped)")
+
+    def handle_import_error(self, error):
+        self.import_button.setEnabled(True)
+        self.status_label.setText(f"Error importing URLs: {error}")
+
     def handle_track_info(self, info):
         self.track_info = info
         self.fetch_button.setEnabled(True)
@@ -483,25 +1224,38 @@ class SoundCloudGoPlusDownloaderGUI(QMainWindow):
         self.cancel_button.show()
         self.status_label.clear()
         
-        self.setFixedHeight(WINDOW_HEIGHT)
+        self._update_window_height()
 
     def _load_cover_art(self, thumb_url):
+        self.cover_url = thumb_url
+        self.cover_label.clear()
         if not thumb_url:
             return
-            
-        try:
-            response = requests.get(thumb_url, timeout=REQUEST_TIMEOUT)
-            if response.status_code == 200:
-                pixmap = QPixmap()
-                pixmap.loadFromData(response.content)
-                scaled_pixmap = pixmap.scaled(
-                    100, 100, 
-                    Qt.AspectRatioMode.KeepAspectRatio, 
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                self.cover_label.setPixmap(scaled_pixmap)
-        except requests.exceptions.RequestException:
-            pass
+
+        pixmap = self.preview_cache.get(thumb_url)
+        if pixmap is not None:
+            self.preview_cache.move_to_end(thumb_url)
+            self.cover_label.setPixmap(pixmap)
+            return
+
+        loader = ArtworkLoader(thumb_url)
+        loader.loaded.connect(self.handle_cover_art)
+        loader.finished.connect(lambda: self._release_artwork_loader(loader))
+        self.artwork_loaders.add(loader)
+        loader.start()
+
+    def handle_cover_art(self, url, image):
+        pixmap = QPixmap.fromImage(image)
+        self.preview_cache[url] = pixmap
+        while len(self.preview_cache) > PREVIEW_CACHE_SIZE:
+            self.preview_cache.popitem(last=False)
+
+        if url == self.cover_url:
+            self.cover_label.setPixmap(pixmap)
+
+    def _release_artwork_loader(self, loader):
+        self.artwork_loaders.discard(loader)
+        loader.deleteLater()
 
     def handle_fetch_error(self, error):
         self.fetch_button.setEnabled(True)
@@ -519,6 +1273,18 @@ class SoundCloudGoPlusDownloaderGUI(QMainWindow):
     def reset_cookies(self):
         self.cookies_input.setText(DEFAULT_COOKIES)
 
+    def set_max_downloads(self, value):
+        self.settings.setValue('max_downloads', value)
+        self.download_queue.set_max_workers(value)
+
+    def set_download_segments(self, value):
+        self.settings.setValue('download_segments', value)
+        self.download_queue.set_segments(value)
+
+    def set_speed_limit(self, value):
+        self.settings.setValue('bandwidth_limit_kbps', value)
+        get_bandwidth_limiter().set_rate(value * 1024)
+
     def cancel_clicked(self):
         self.track_info = None
         self.status_label.clear()
@@ -527,16 +1293,8 @@ class SoundCloudGoPlusDownloaderGUI(QMainWindow):
     def clear_form(self):
         self.url_input.clear()
         self.track_info = None
-        self.status_label.clear()
-        self.download_button.setText("Download")
         self._reset_ui_state()
 
-    def button_clicked(self):
-        if self.download_button.text() == "Clear":
-            self.clear_form()
-        else:
-            self.start_download()
-
     def start_download(self):
         output_dir = self.dir_input.text().strip()
 
@@ -548,53 +1306,69 @@ class SoundCloudGoPlusDownloaderGUI(QMainWindow):
             output_dir = self.default_music_dir
             self.dir_input.setText(output_dir)
 
-        self.download_button.hide()
-        self.cancel_button.hide()
-        self.progress_bar.show()
-        self.progress_bar.setValue(0)
-        self.status_label.setText("Downloading...")
+        self.download_queue.enqueue(self.track_info, output_dir, self.track_url,
+                                    self.cookies_input.text().strip())
+        self.clear_form()
+        self.update_queue_summary()
 
-        if self.worker:
-            self.worker.deleteLater()
-            
-        self.worker = DownloaderWorker(self.track_info, output_dir)
-        self.worker.progress.connect(self.update_progress)
-        self.worker.progress_status.connect(self.update_progress_status)
-        self.worker.finished.connect(self.download_finished)
-        self.worker.error.connect(self.download_error)
-        self.worker.start()
-
-    def update_progress(self, value):
-        self.progress_bar.setValue(value)
-
-    def update_progress_status(self, status):
-        self.status_label.setText(status)
-
-    def download_finished(self, message):
-        self.progress_bar.hide()
-        self.status_label.setText(message)
-        self.open_button.show()
-        self.download_button.setText("Clear") 
-        self.download_button.show()
-        self.cancel_button.hide()
+    def cancel_selected_jobs(self):
+        rows = {index.row() for index in self.queue_table.selectionModel().selectedRows()}
+        if not rows:
+            self.download_queue.cancel_all()
+            return
+        for row in rows:
+            self.download_queue.cancel(self.job_model.job_id_at(row))
 
-    def download_error(self, error_message):
-        self.progress_bar.hide()
-        self.status_label.setText(error_message)
-        self.download_button.setText("Retry")
-        self.download_button.show()
-        self.cancel_button.show()
+    def refresh_queue_view(self):
+        has_jobs = self.job_model.rowCount() > 0
+        if has_jobs == self.queue_widget.isHidden():
+            self.queue_widget.setVisible(has_jobs)
+            self._update_window_height()
+        self.update_queue_summary()
+
+    def update_queue_summary(self):
+        counts = {}
+        for job in self.download_queue.jobs.values():
+            counts[job.state] = counts.get(job.state, 0) + 1
+        parts = [f"{counts[state]} {state.lower()}" for state in
+                 (JOB_RUNNING, JOB_QUEUED, JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+                 if counts.get(state)]
+        self.status_label.setText(", ".join(parts))
         
     def closeEvent(self, event):
         if self.fetcher:
             self.fetcher.quit()
             self.fetcher.wait()
-        if self.worker:
-            self.worker.quit()
-            self.worker.wait()
+        if self.expander:
+            self.expander.requestInterruption()
+            self.expander.wait()
+        if self.importer:
+            self.importer.requestInterruption()
+            self.importer.wait()
+        self.cancel_prefetch()
+        for prefetcher in list(self.prefetchers):
+            prefetcher.wait()
+        for loader in list(self.artwork_loaders):
+            loader.requestInterruption()
+            loader.wait()
+        self.download_queue.shutdown()
+        close_http_client()
+        close_track_info_cache()
+        close_postprocessor()
+        close_resolver()
+        close_metrics()
+        close_library_index()
         event.accept()
 
+def report_startup_time(window):
+    startup_ms = (time.perf_counter() - STARTUP_STARTED) * 1000
+    window.settings.setValue('startup_time_ms', round(startup_ms, 1))
+    if "--startup-time" in sys.argv:
+        print(f"Startup time: {startup_ms:.1f} ms")
+        QApplication.quit()
+
 def main():
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     qdarktheme.setup_theme(
         custom_colors={
@@ -605,6 +1379,7 @@ def main():
     )
     window = SoundCloudGoPlusDownloaderGUI()
     window.show()
+    QTimer.singleShot(0, lambda: report_startup_time(window))
     sys.exit(app.exec())
 
 if __name__ == "__main__":
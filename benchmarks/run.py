@@ -0,0 +1,306 @@
+import os
+import sys
+import json
+import time
+import queue
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.server import BenchmarkServer
+
+MB = 1024 * 1024
+
+SCENARIOS = {
+    'baseline': {'latency': 0.02},
+    'throttled': {'latency': 0.05, 'bandwidth': 2 * MB},
+    'no-ranges': {'latency': 0.02, 'ranges': False},
+    'flaky': {'latency': 0.02, 'failure_rate': 0.1},
+}
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(values):
+    return {
+        'count': len(values),
+        'mean': sum(values) / len(values) if values else 0.0,
+        'p50': percentile(values, 0.5),
+        'p95': percentile(values, 0.95),
+        'max': max(values) if values else 0.0
+    }
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / MB if sys.platform == "darwin" else peak / 1024
+
+class PhaseTimer:
+    def __init__(self):
+        self.wall = {}
+        self._lock = threading.Lock()
+
+    def record(self, phase, wall):
+        with self._lock:
+            self.wall.setdefault(phase, []).append(wall)
+
+    def measure(self, phase, func, *args, **kwargs):
+        wall_start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.record(phase, time.perf_counter() - wall_start)
+
+def _children_cpu():
+    times = os.times()
+    return times.children_user + times.children_system
+
+def measure_cpu(func, *args):
+    cpu_start = time.process_time() + _children_cpu()
+    result = func(*args)
+    return result, time.process_time() + _children_cpu() - cpu_start
+
+def run_phase_passes(server, args, work_dir):
+    from soundcloud_goplus import (Downloader, resolve_track, fetch_cover, get_postprocessor,
+                                   close_postprocessor)
+
+    output_dir = os.path.join(work_dir, "phases")
+    os.makedirs(output_dir)
+    urls = [f"https://soundcloud.com/benchmark/track-{track_id}" for track_id in range(args.tracks)]
+
+    def run_pass(func, items):
+        def call(item):
+            try:
+                return func(*item)
+            except Exception:
+                return None
+
+        with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+            return list(executor.map(call, items))
+
+    def resolve(url):
+        return resolve_track(url, use_cache=False, endpoint=server.scinfo_url)
+
+    def download(url, info):
+        filepath = os.path.join(output_dir, f"{url.rsplit('/', 1)[1]}.m4a")
+        Downloader(segments=args.connections).download(info['dlink_m4a'], filepath)
+        return filepath
+
+    def tag(filepath, info, url, cover):
+        get_postprocessor().process(filepath, info, url, cover)
+        return True
+
+    def tag_all(jobs):
+        get_postprocessor().start()
+        results = run_pass(tag, jobs)
+        close_postprocessor()
+        return results
+
+    cpu = {}
+    infos, cpu['resolve'] = measure_cpu(run_pass, resolve, [(url,) for url in urls])
+    resolved = [(url, info) for url, info in zip(urls, infos) if info]
+    paths, cpu['download'] = measure_cpu(run_pass, download, resolved)
+    covers = run_pass(lambda url, info: fetch_cover(info), resolved)
+    jobs = [(path, info, url, cover) for (url, info), path, cover in zip(resolved, paths, covers) if path]
+    _, cpu['tag'] = measure_cpu(tag_all, jobs)
+
+    total_mb = sum(os.path.getsize(job[0]) for job in jobs) / MB
+    return {phase: {'cpu_seconds': value, 'cpu_seconds_per_mb': value / total_mb if total_mb else None}
+            for phase, value in cpu.items()}
+
+def run_scenario(name, options, args):
+    from soundcloud_goplus import (DownloadTask, resolve_track, configure_http_client, configure_artwork_cache,
+                                   configure_track_info_cache, configure_postprocessor, close_postprocessor)
+    from soundcloud_goplus.constants import POSTPROCESS_WORKERS
+
+    work_dir = tempfile.mkdtemp(prefix=f"scgp-bench-{name}-")
+    output_dir = os.path.join(work_dir, "output")
+    os.makedirs(output_dir)
+    configure_http_client(pool_maxsize=max(16, args.jobs * args.connections))
+    configure_artwork_cache(directory=os.path.join(work_dir, "artwork"))
+    configure_track_info_cache(path=os.path.join(work_dir, "track_info.sqlite3"))
+    configure_postprocessor(workers=POSTPROCESS_WORKERS)
+
+    server = BenchmarkServer(payload_size=int(args.size_mb * MB), **options)
+    timer = PhaseTimer()
+    errors = []
+
+    def process(track_id):
+        url = f"https://soundcloud.com/benchmark/track-{track_id}"
+        try:
+            info = timer.measure('resolve', resolve_track, url, use_cache=False,
+                                 endpoint=server.scinfo_url)
+            task = DownloadTask(info, output_dir, segments=args.connections)
+            filepath = timer.measure('task', task.run)
+            for phase in ('download', 'tag', 'artwork'):
+                timer.record(phase, task.metrics.phases.get(phase, 0.0))
+            return os.path.getsize(filepath)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+            return 0
+
+    with server:
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time() + _children_cpu()
+        with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+            sizes = list(executor.map(process, range(args.tracks)))
+        wall = time.perf_counter() - wall_start
+        close_postprocessor()
+        cpu = time.process_time() + _children_cpu() - cpu_start
+
+        phase_cpu = run_phase_passes(server, args, work_dir)
+    shutil.rmtree(work_dir, ignore_errors=True)
+
+    phases = {phase: summarize(values) for phase, values in timer.wall.items()}
+    for phase, values in phase_cpu.items():
+        phases.setdefault(phase, summarize([])).update(values)
+
+    total_mb = sum(sizes) / MB
+    completed = sum(1 for size in sizes if size)
+    return {
+        'options': options,
+        'tracks': args.tracks,
+        'completed': completed,
+        'errors': errors[:10],
+        'error_count': len(errors),
+        'wall_seconds': wall,
+        'total_mb': total_mb,
+        'throughput_mb_s': total_mb / wall if wall else 0.0,
+        'tracks_per_second': completed / wall if wall else 0.0,
+        'cpu_seconds': cpu,
+        'cpu_seconds_per_mb': cpu / total_mb if total_mb else None,
+        'peak_rss_mb': peak_rss_mb(),
+        'requests': dict(server.requests),
+        'phases': phases
+    }
+
+def _scenario_process(name, options, args, results):
+    results.put(run_scenario(name, options, args))
+
+def run_isolated(name, options, args):
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_scenario_process, args=(name, options, args, results))
+    process.start()
+    while True:
+        try:
+            result = results.get(timeout=1.0)
+            break
+        except queue.Empty:
+            if process.is_alive():
+                continue
+            try:
+                result = results.get(timeout=1.0)
+                break
+            except queue.Empty:
+                raise RuntimeError(f"Scenario {name} exited with code {process.exitcode} "
+                                   f"without a result")
+    process.join()
+    return result
+
+def print_result(name, result):
+    print(f"{name}: {result['completed']}/{result['tracks']} tracks, "
+          f"{result['throughput_mb_s']:.1f} MB/s, {result['wall_seconds']:.2f}s, "
+          f"peak RSS {result['peak_rss_mb'] or 0:.0f} MB, "
+          f"{result['cpu_seconds_per_mb'] or 0:.4f} CPU s/MB, {result['error_count']} errors")
+    for phase in ('resolve', 'download', 'tag'):
+        stats = result['phases'].get(phase)
+        if stats:
+            print(f"    {phase:<9} p50 {stats['p50'] * 1000:8.1f} ms   p95 {stats['p95'] * 1000:8.1f} ms   "
+                  f"max {stats['max'] * 1000:8.1f} ms   {stats.get('cpu_seconds_per_mb') or 0:.4f} CPU s/MB")
+
+def compare(previous, current):
+    metrics = [
+        ('throughput_mb_s', 'throughput MB/s', True),
+        ('cpu_seconds_per_mb', 'CPU s/MB', False),
+        ('peak_rss_mb', 'peak RSS MB', False),
+    ]
+    print("\nComparison with previous run:")
+    for name, result in current['scenarios'].items():
+        old = previous.get('scenarios', {}).get(name)
+        if not old:
+            continue
+        print(f"  {name}")
+        rows = [(label, old.get(key), result.get(key), higher_is_better) for key, label, higher_is_better in metrics]
+        for phase in ('resolve', 'download', 'tag'):
+            old_phase = old.get('phases', {}).get(phase, {})
+            new_phase = result.get('phases', {}).get(phase, {})
+            rows.append((f"{phase} p95 s", old_phase.get('p95'), new_phase.get('p95'), False))
+            rows.append((f"{phase} CPU s/MB", old_phase.get('cpu_seconds_per_mb'),
+                         new_phase.get('cpu_seconds_per_mb'), False))
+        for label, before, after, higher_is_better in rows:
+            if not before or after is None:
+                continue
+            change = (after - before) / before * 100
+            better = change > 0 if higher_is_better else change < 0
+            marker = "better" if better else "worse" if change else ""
+            print(f"    {label:<18} {before:10.4f} -> {after:10.4f}  ({change:+6.1f}% {marker})")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the SoundCloud Go+ download engine.")
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="scenario to run (default: all)")
+    parser.add_argument("-t", "--tracks", type=int, default=20, help="tracks per scenario")
+    parser.add_argument("--size-mb", type=float, default=4.0, help="audio payload size per track")
+    parser.add_argument("-j", "--jobs", type=int, default=3, help="concurrent tracks")
+    parser.add_argument("-c", "--connections", type=int, default=4, help="connections per download")
+    parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", metavar="FILE", help="compare with a previous JSON result")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    names = args.scenario or list(SCENARIOS)
+
+    results = {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'tracks': args.tracks,
+            'size_mb': args.size_mb,
+            'jobs': args.jobs,
+            'connections': args.connections
+        },
+        'scenarios': {}
+    }
+
+    failed = 0
+    for name in names:
+        try:
+            result = run_isolated(name, SCENARIOS[name], args)
+        except RuntimeError as e:
+            failed += 1
+            results['scenarios'][name] = {'error': str(e)}
+            print(f"{name}: {str(e)}", file=sys.stderr)
+            continue
+        results['scenarios'][name] = result
+        print_result(name, result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(json.load(f), results)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
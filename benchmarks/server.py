@@ -0,0 +1,192 @@
+import re
+import json
+import time
+import random
+import struct
+import threading
+from urllib.parse import parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+WRITE_CHUNK_SIZE = 64 * 1024
+THUMB_SIZE = 32 * 1024
+AUDIO_PATH = re.compile(r"^/audio/(\d+)\.m4a$")
+THUMB_PATH = re.compile(r"^/thumb/(\d+)\.jpg$")
+RANGE_HEADER = re.compile(r"bytes=(\d*)-(\d*)")
+
+def _atom(name, data):
+    return struct.pack(">I4s", 8 + len(data), name) + data
+
+def make_m4a(payload_size, seed=0):
+    ftyp = _atom(b"ftyp", b"M4A \x00\x00\x02\x00M4A mp42isom")
+    mvhd = _atom(b"mvhd", b"\x00" * 4 + struct.pack(">IIII", 0, 0, 1000, 180000) + b"\x00" * 80)
+    mdhd = _atom(b"mdhd", b"\x00" * 4 + struct.pack(">IIII", 0, 0, 44100, 44100 * 180) + b"\x00" * 4)
+    hdlr = _atom(b"hdlr", b"\x00" * 8 + b"soun" + b"\x00" * 13)
+    moov = _atom(b"moov", mvhd + _atom(b"trak", _atom(b"mdia", mdhd + hdlr)))
+    mdat = _atom(b"mdat", random.Random(seed).randbytes(payload_size))
+    return ftyp + moov + mdat
+
+def make_jpeg(size, seed=0):
+    return b"\xff\xd8\xff\xe0" + random.Random(seed).randbytes(size - 6) + b"\xff\xd9"
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass
+
+class BenchmarkServer:
+    def __init__(self, payload_size=4 * 1024 * 1024, latency=0.0, bandwidth=None,
+                 ranges=True, failure_rate=0.0, seed=0):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.ranges = ranges
+        self.failure_rate = failure_rate
+        self.audio = make_m4a(payload_size, seed)
+        self.thumb = make_jpeg(THUMB_SIZE, seed)
+        self.requests = {'scinfo': 0, 'audio': 0, 'thumb': 0, 'failures': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def scinfo_url(self):
+        return f"{self.base_url}/api/scinfo.php"
+
+    def start(self):
+        self._server = _QuietServer(("127.0.0.1", 0), self._create_handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _count(self, key):
+        with self._lock:
+            self.requests[key] += 1
+
+    def _should_fail(self):
+        with self._lock:
+            failed = self._random.random() < self.failure_rate
+            if failed:
+                self.requests['failures'] += 1
+            return failed
+
+    def track_info(self, track_id):
+        return {
+            "name": f"Benchmark Track {track_id}",
+            "artist": "Benchmark Artist",
+            "date": "2024-01-01",
+            "duration": "3:00",
+            "thumb": f"{self.base_url}/thumb/{track_id}.jpg",
+            "dlink_m4a": f"{self.base_url}/audio/{track_id}.m4a"
+        }
+
+    def _create_handler(self):
+        bench = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_body(self, status, body, content_type, extra_headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (extra_headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                if self.command != "HEAD":
+                    self._write_throttled(body)
+
+            def _write_throttled(self, body):
+                started = time.perf_counter()
+                sent = 0
+                for offset in range(0, len(body), WRITE_CHUNK_SIZE):
+                    chunk = body[offset:offset + WRITE_CHUNK_SIZE]
+                    self.wfile.write(chunk)
+                    sent += len(chunk)
+                    if bench.bandwidth:
+                        delay = sent / bench.bandwidth - (time.perf_counter() - started)
+                        if delay > 0:
+                            time.sleep(delay)
+
+            def _send_error(self, status):
+                self._send_body(status, b"", "text/plain")
+
+            def do_POST(self):
+                time.sleep(bench.latency)
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                if self.path != "/api/scinfo.php":
+                    return self._send_error(404)
+
+                form = parse_qs(body.decode("utf-8"))
+                bench._count('scinfo')
+                if bench._should_fail():
+                    return self._send_error(503)
+
+                url = form.get("url", [""])[0]
+                track_id = int(re.sub(r"\D", "", url) or 0)
+                body = json.dumps(bench.track_info(track_id)).encode("utf-8")
+                self._send_body(200, body, "application/json")
+
+            def do_HEAD(self):
+                self.do_GET()
+
+            def do_GET(self):
+                time.sleep(bench.latency)
+                if THUMB_PATH.match(self.path):
+                    bench._count('thumb')
+                    return self._send_body(200, bench.thumb, "image/jpeg")
+                if not AUDIO_PATH.match(self.path):
+                    return self._send_error(404)
+
+                bench._count('audio')
+                status = 200
+                body = bench.audio
+                headers = {"Accept-Ranges": "bytes"} if bench.ranges else {}
+                match = RANGE_HEADER.match(self.headers.get("Range", ""))
+                if bench.ranges and match:
+                    start = int(match.group(1) or 0)
+                    end = min(int(match.group(2) or len(body) - 1), len(body) - 1)
+                    if start > end:
+                        return self._send_error(416)
+                    status = 206
+                    body = body[start:end + 1]
+                    headers["Content-Range"] = f"bytes {start}-{end}/{len(bench.audio)}"
+
+                if bench._should_fail():
+                    if bench._random.random() < 0.5:
+                        return self._send_error(503)
+                    self._send_truncated(status, body, headers)
+                    return
+
+                self._send_body(status, body, "audio/mp4", headers)
+
+            def _send_truncated(self, status, body, headers):
+                self.send_response(status)
+                self.send_header("Content-Type", "audio/mp4")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self._write_throttled(body[:len(body) // 3])
+                self.close_connection = True
+
+        return Handler
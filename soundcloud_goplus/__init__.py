@@ -0,0 +1,58 @@
+from .constants import DEFAULT_COOKIES
+from .network import HttpClient, get_http_client, configure_http_client, close_http_client
+from .urls import (normalize_soundcloud_url, get_link_expiry, get_collection_kind,
+                   extract_soundcloud_urls, is_short_link)
+from .cache import (ArtworkCache, TrackInfoCache, get_cache_dir, get_artwork_cache,
+                    configure_artwork_cache, get_track_info_cache, get_track_info_cache_stats,
+                    configure_track_info_cache, close_track_info_cache)
+from .resolver import (ResolveError, ScinfoBackend, ResolverEndpoint, ResolverPool, resolve_track,
+                       refresh_track_info, get_resolver_pool, configure_resolver, close_resolver)
+from .downloader import Downloader, DownloadCancelled, IncompleteDownloadError, format_file_size
+from .playlist import (PlaylistError, SoundCloudApi, get_soundcloud_api, get_track_title,
+                       expand_url)
+from .sessions import CookiePool, CookieSession, parse_cookies, get_cookie_pool, get_cookie_pools
+from .limits import (TokenBucket, HostLimiter, get_bandwidth_limiter, get_host_limiter,
+                     configure_limits, parse_rate)
+from .tagging import TagError, add_metadata, build_tags, apply_tags, make_tags, fetch_cover
+from .postprocess import (PostProcessor, DEFAULT_STEPS, resize_cover, tag_track,
+                          cover_resizing_available, get_postprocessor, configure_postprocessor, close_postprocessor)
+from .verify import VerifyError, PieceHasher, AudioHasher, content_hash, find_audio, hash_audio, check_mp4
+from .library import (LibraryIndex, read_source_url, get_library_index, configure_library_index,
+                      close_library_index)
+from .metrics import (JobMetrics, MetricsRecorder, classify_error, get_metrics, configure_metrics,
+                      close_metrics)
+from .ingest import SeenUrls, UrlIngester, canonicalize_url, resolve_short_link
+from .engine import (DownloadTask, BatchResult, create_safe_filename, download_track,
+                     download_url, expand_urls, resolve_with_metrics, run_batch)
+from .daemon import JobStore, EventBus, DownloadDaemon, submit_to_daemon
+
+__all__ = [
+    "DEFAULT_COOKIES",
+    "HttpClient", "get_http_client", "configure_http_client", "close_http_client",
+    "normalize_soundcloud_url", "get_link_expiry", "get_collection_kind",
+    "extract_soundcloud_urls", "is_short_link",
+    "ArtworkCache", "TrackInfoCache", "get_cache_dir", "get_artwork_cache",
+    "configure_artwork_cache", "get_track_info_cache", "get_track_info_cache_stats",
+    "configure_track_info_cache",
+    "close_track_info_cache",
+    "ResolveError", "ScinfoBackend", "ResolverEndpoint", "ResolverPool", "resolve_track",
+    "refresh_track_info", "get_resolver_pool", "configure_resolver", "close_resolver",
+    "Downloader", "DownloadCancelled", "IncompleteDownloadError", "format_file_size",
+    "PlaylistError", "SoundCloudApi", "get_soundcloud_api", "get_track_title", "expand_url",
+    "CookiePool", "CookieSession", "parse_cookies", "get_cookie_pool", "get_cookie_pools",
+    "TokenBucket", "HostLimiter", "get_bandwidth_limiter", "get_host_limiter",
+    "configure_limits", "parse_rate",
+    "TagError", "add_metadata", "build_tags", "apply_tags", "make_tags", "fetch_cover",
+    "PostProcessor", "DEFAULT_STEPS", "resize_cover", "tag_track",
+    "cover_resizing_available", "get_postprocessor", "configure_postprocessor",
+    "close_postprocessor",
+    "VerifyError", "PieceHasher", "AudioHasher", "content_hash", "find_audio", "hash_audio", "check_mp4",
+    "LibraryIndex", "read_source_url", "get_library_index", "configure_library_index",
+    "close_library_index",
+    "JobMetrics", "MetricsRecorder", "classify_error", "get_metrics", "configure_metrics",
+    "close_metrics",
+    "SeenUrls", "UrlIngester", "canonicalize_url", "resolve_short_link",
+    "DownloadTask", "BatchResult", "create_safe_filename", "download_track",
+    "download_url", "expand_urls", "resolve_with_metrics", "run_batch",
+    "JobStore", "EventBus", "DownloadDaemon", "submit_to_daemon",
+]
@@ -0,0 +1,278 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+
+from .constants import (APP_NAME, REQUEST_TIMEOUT, ARTWORK_CACHE_MAX_MB,
+                        TRACK_INFO_TTL, TRACK_INFO_EXPIRY_MARGIN)
+from .network import get_http_client
+from .urls import normalize_soundcloud_url, get_link_expiry
+
+def get_cache_dir():
+    base_dir = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME')
+    if not base_dir:
+        base_dir = str(Path.home() / ".cache")
+    return os.path.join(base_dir, APP_NAME)
+
+class ArtworkCache:
+    def __init__(self, directory=None, max_bytes=ARTWORK_CACHE_MAX_MB * 1024 * 1024):
+        self.directory = directory or os.path.join(get_cache_dir(), "artwork")
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.directory, "index.json")
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._blobs = {}
+        self._total_bytes = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._index = self._load_index()
+        self._scan_blobs()
+
+    def _blob_path(self, digest):
+        return os.path.join(self.directory, digest[:2], digest)
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        os.replace(temp_path, self.index_path)
+
+    def _scan_blobs(self):
+        for entry in os.scandir(self.directory):
+            if not entry.is_dir():
+                continue
+            for blob in os.scandir(entry.path):
+                if blob.name.endswith(".tmp"):
+                    continue
+                stat = blob.stat()
+                self._blobs[blob.name] = [stat.st_size, stat.st_mtime]
+                self._total_bytes += stat.st_size
+        self._index = {url: digest for url, digest in self._index.items() if digest in self._blobs}
+
+    def _read(self, url):
+        with self._lock:
+            digest = self._index.get(url)
+            if digest is None:
+                return None
+            self._blobs[digest][1] = time.time()
+        path = self._blob_path(digest)
+        try:
+            os.utime(path)
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            with self._lock:
+                self._forget(digest)
+            return None
+
+    def _store(self, url, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        with self._lock:
+            if digest not in self._blobs:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = path + ".tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+                self._blobs[digest] = [len(data), time.time()]
+                self._total_bytes += len(data)
+            self._index[url] = digest
+            self._evict()
+            self._save_index()
+
+    def _forget(self, digest):
+        size, _ = self._blobs.pop(digest, (0, 0))
+        self._total_bytes -= size
+        self._index = {url: d for url, d in self._index.items() if d != digest}
+
+    def _evict(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+        for digest, _ in sorted(self._blobs.items(), key=lambda item: item[1][1]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError:
+                pass
+            self._forget(digest)
+
+    def get(self, url):
+        if not url:
+            return None
+
+        data = self._read(url)
+        if data is not None:
+            return data
+
+        with self._lock:
+            event = self._in_flight.get(url)
+            owner = event is None
+            if owner:
+                event = threading.Event()
+                self._in_flight[url] = event
+
+        if not owner:
+            event.wait(REQUEST_TIMEOUT)
+            return self._read(url)
+
+        import requests
+
+        try:
+            response = get_http_client().get(url)
+            response.raise_for_status()
+            if response.content:
+                self._store(url, response.content)
+                return response.content
+            return None
+        except requests.exceptions.RequestException:
+            return None
+        finally:
+            with self._lock:
+                del self._in_flight[url]
+            event.set()
+
+_artwork_cache = None
+_artwork_cache_options = {}
+_artwork_cache_lock = threading.Lock()
+
+def get_artwork_cache():
+    global _artwork_cache
+    with _artwork_cache_lock:
+        if _artwork_cache is None:
+            _artwork_cache = ArtworkCache(**_artwork_cache_options)
+        return _artwork_cache
+
+def configure_artwork_cache(**kwargs):
+    global _artwork_cache, _artwork_cache_options
+    with _artwork_cache_lock:
+        _artwork_cache = None
+        _artwork_cache_options = kwargs
+
+class TrackInfoCache:
+    def __init__(self, path=None, ttl=TRACK_INFO_TTL):
+        self.path = path or os.path.join(get_cache_dir(), "track_info.sqlite3")
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS track_info ("
+                "url TEXT PRIMARY KEY, data TEXT NOT NULL, "
+                "fetched_at REAL NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _expires_at(self, info, now):
+        expires_at = now + self.ttl
+        link_expiry = get_link_expiry(info.get('dlink_m4a', ''))
+        if link_expiry is not None:
+            expires_at = min(expires_at, link_expiry - TRACK_INFO_EXPIRY_MARGIN)
+        return expires_at
+
+    def get(self, url):
+        key = normalize_soundcloud_url(url)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data, expires_at FROM track_info WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if row[1] <= time.time():
+                self.expired += 1
+                self.misses += 1
+                with self._connection:
+                    self._connection.execute("DELETE FROM track_info WHERE url = ?", (key,))
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, url, info):
+        if not info.get('dlink_m4a'):
+            return
+        now = time.time()
+        expires_at = self._expires_at(info, now)
+        if expires_at <= now:
+            return
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO track_info (url, data, fetched_at, expires_at) VALUES (?, ?, ?, ?)",
+                (normalize_soundcloud_url(url), json.dumps(info), now, expires_at)
+            )
+
+    def invalidate(self, url):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM track_info WHERE url = ?", (normalize_soundcloud_url(url),))
+
+    def purge_expired(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM track_info WHERE expires_at <= ?", (time.time(),))
+
+    def stats(self):
+        with self._lock:
+            entries = self._connection.execute("SELECT COUNT(*) FROM track_info").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                'entries': entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'expired': self.expired,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+_track_info_cache = None
+_track_info_cache_options = {}
+_track_info_cache_lock = threading.Lock()
+
+def get_track_info_cache():
+    global _track_info_cache
+    with _track_info_cache_lock:
+        if _track_info_cache is None:
+            _track_info_cache = TrackInfoCache(**_track_info_cache_options)
+            _track_info_cache.purge_expired()
+        return _track_info_cache
+
+def get_track_info_cache_stats():
+    with _track_info_cache_lock:
+        cache = _track_info_cache
+    if cache is None:
+        return None
+    try:
+        return cache.stats()
+    except sqlite3.Error:
+        return None
+
+def configure_track_info_cache(**kwargs):
+    global _track_info_cache_options
+    with _track_info_cache_lock:
+        _track_info_cache_options = kwargs
+    close_track_info_cache()
+
+def close_track_info_cache():
+    global _track_info_cache
+    with _track_info_cache_lock:
+        old_cache = _track_info_cache
+        _track_info_cache = None
+    if old_cache is not None:
+        old_cache.close()
@@ -0,0 +1,251 @@
+import sys
+import time
+import argparse
+import threading
+from pathlib import Path
+
+from .constants import (DEFAULT_COOKIES, DEFAULT_MAX_DOWNLOADS, MAX_DOWNLOADS_LIMIT,
+                        DEFAULT_DOWNLOAD_SEGMENTS, MAX_DOWNLOAD_SEGMENTS, HTTP_RETRIES,
+                        HTTP_POOL_MAXSIZE, DEFAULT_RESOLVE_WORKERS, DAEMON_PORT,
+                        POSTPROCESS_WORKERS)
+from .engine import run_batch
+from .network import configure_http_client
+from .metrics import configure_metrics, get_metrics, close_metrics
+from .library import get_library_index, close_library_index
+from .limits import configure_limits, parse_rate
+from .sessions import get_cookie_pool
+from .daemon import DownloadDaemon, submit_to_daemon
+from .ingest import UrlIngester
+from .postprocess import configure_postprocessor, close_postprocessor
+from .cache import get_track_info_cache_stats
+from .resolver import configure_resolver, get_resolver_pool, close_resolver
+
+def iter_urls(urls, input_files, ingester):
+    yield from ingester.feed(urls)
+    for input_file in input_files:
+        yield from ingester.read(input_file)
+
+def print_ingest_summary(ingester):
+    if ingester.duplicates or ingester.rejected:
+        print(f"{ingester.duplicates} duplicate URLs ignored, "
+              f"{ingester.rejected} lines without a SoundCloud URL", file=sys.stderr)
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="soundcloud_goplus",
+        description="Download SoundCloud tracks as 256Kbps M4A without the GUI."
+    )
+    parser.add_argument("urls", nargs="*", metavar="URL",
+                        help="SoundCloud track, set, playlist or user URLs")
+    parser.add_argument("-i", "--input", action="append", default=[], metavar="FILE",
+                        help="read URLs from a text or CSV FILE ('-' for stdin)")
+    parser.add_argument("-o", "--output", metavar="DIR",
+                        help="output directory (default: ~/Music, or the daemon's with --submit)")
+    parser.add_argument("-j", "--jobs", type=int, default=DEFAULT_MAX_DOWNLOADS,
+                        help=f"concurrent downloads (default: {DEFAULT_MAX_DOWNLOADS})")
+    parser.add_argument("-c", "--connections", type=int, default=DEFAULT_DOWNLOAD_SEGMENTS,
+                        help=f"connections per download (default: {DEFAULT_DOWNLOAD_SEGMENTS})")
+    parser.add_argument("-r", "--resolvers", type=int, default=DEFAULT_RESOLVE_WORKERS,
+                        help=f"concurrent track info lookups (default: {DEFAULT_RESOLVE_WORKERS})")
+    parser.add_argument("--no-expand", action="store_true",
+                        help="treat every URL as a single track instead of expanding sets and users")
+    parser.add_argument("--cookies", action="append", default=[], metavar="COOKIES",
+                        help="cookies sent to the track info service; repeat or separate "
+                             "sessions with '|' to spread requests over several")
+    parser.add_argument("--cookies-file", metavar="FILE",
+                        help="read one cookie session per line from FILE")
+    parser.add_argument("--resolver", action="append", default=[], metavar="URL",
+                        help="track info endpoint; repeat to fail over between several "
+                             "(default: the built-in service)")
+    parser.add_argument("--no-hedge", action="store_true",
+                        help="do not send a second track info request when the first one is slow")
+    parser.add_argument("--retries", type=int, default=HTTP_RETRIES,
+                        help=f"HTTP retries per request (default: {HTTP_RETRIES})")
+    parser.add_argument("--no-cache", action="store_true", help="always re-resolve track info")
+    parser.add_argument("--limit-rate", type=parse_rate, default=0, metavar="RATE",
+                        help="cap total download speed, e.g. 500K or 2M bytes per second")
+    parser.add_argument("--host-connections", type=int, default=0, metavar="N",
+                        help="max concurrent connections per host (default: unlimited)")
+    parser.add_argument("--host-rate", type=float, default=0, metavar="N",
+                        help="max new requests per second per host (default: unlimited)")
+    parser.add_argument("--no-skip", action="store_true",
+                        help="download tracks again even if the library index already has them")
+    parser.add_argument("--rebuild-index", action="store_true",
+                        help="index tagged tracks already in the output directory before downloading")
+    parser.add_argument("--tag-workers", type=int, default=POSTPROCESS_WORKERS, metavar="N",
+                        help=f"processes for tagging and cover resizing, 0 to tag in the download "
+                             f"threads (default: {POSTPROCESS_WORKERS})")
+    parser.add_argument("--cover-size", type=int, default=0, metavar="PX",
+                        help="downscale embedded cover art larger than PX pixels (needs Pillow)")
+    parser.add_argument("--extra-tags", action="store_true",
+                        help="also write the title and a comment with the track URL")
+    parser.add_argument("--metrics-log", metavar="FILE",
+                        help="append per-job timings, bytes, retries and errors to FILE as JSON lines")
+    parser.add_argument("--metrics-file", metavar="FILE",
+                        help="keep a Prometheus text file with aggregated metrics at FILE")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help="serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument("--daemon", action="store_true",
+                        help="run as a background service with a persistent job queue and a local JSON API")
+    parser.add_argument("--submit", action="store_true",
+                        help="hand the URLs to a running daemon instead of downloading them here")
+    parser.add_argument("--allow-any-output-dir", action="store_true",
+                        help="let API clients choose output directories outside the daemon's -o")
+    parser.add_argument("--port", type=int, default=DAEMON_PORT,
+                        help=f"daemon API port on 127.0.0.1 (default: {DAEMON_PORT})")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only report errors")
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if not args.urls and not args.input and not args.daemon:
+        parser.error("no URLs given (pass URLs or --input FILE)")
+
+    ingester = UrlIngester()
+    if args.submit:
+        try:
+            for job in submit_to_daemon(iter_urls(args.urls, args.input, ingester), args.output,
+                                        port=args.port):
+                if not args.quiet:
+                    print(f"Queued job {job['id']}: {job['url']}")
+        finally:
+            ingester.close()
+        if not args.quiet:
+            print_ingest_summary(ingester)
+        return 0
+    args.output = args.output or str(Path.home() / "Music")
+
+    cookies = list(args.cookies)
+    if args.cookies_file:
+        with open(args.cookies_file, 'r', encoding='utf-8') as f:
+            cookies += [line for line in f if not line.lstrip().startswith('#')]
+    pool = get_cookie_pool(cookies or DEFAULT_COOKIES)
+
+    jobs = max(1, min(args.jobs, MAX_DOWNLOADS_LIMIT))
+    connections = max(1, min(args.connections, MAX_DOWNLOAD_SEGMENTS))
+    configure_http_client(
+        retries=args.retries,
+        pool_maxsize=max(HTTP_POOL_MAXSIZE, jobs * connections)
+    )
+    configure_limits(
+        bandwidth=args.limit_rate,
+        host_connections=args.host_connections,
+        host_rate=args.host_rate
+    )
+    configure_resolver(endpoints=args.resolver or None, hedge=not args.no_hedge)
+    resolvers = get_resolver_pool()
+    configure_metrics(jsonl_path=args.metrics_log, prometheus_path=args.metrics_file)
+    try:
+        configure_postprocessor(
+            workers=args.tag_workers,
+            max_cover_size=args.cover_size,
+            extra_tags=args.extra_tags
+        )
+    except ValueError as e:
+        parser.error(f"--cover-size: {str(e)}")
+    if args.metrics_port is not None:
+        get_metrics().serve(args.metrics_port)
+
+    if args.rebuild_index:
+        added = get_library_index().rebuild(args.output) if Path(args.output).is_dir() else 0
+        if not args.quiet:
+            print(f"Indexed {added} existing tracks", file=sys.stderr)
+
+    if args.daemon:
+        return run_daemon(args, pool, jobs, connections, ingester)
+
+    stop_event = threading.Event()
+    results = run_batch(
+        iter_urls(args.urls, args.input, ingester),
+        args.output,
+        max_workers=jobs,
+        cookies=pool,
+        segments=connections,
+        use_cache=not args.no_cache,
+        stop_event=stop_event,
+        resolve_workers=args.resolvers,
+        expand=not args.no_expand,
+        skip_existing=not args.no_skip
+    )
+
+    completed = 0
+    skipped = 0
+    failed = 0
+    try:
+        for result in results:
+            if result.skipped:
+                skipped += 1
+                if not args.quiet:
+                    print(f"Skipped (already downloaded): {result.filepath}")
+            elif result.ok:
+                completed += 1
+                if not args.quiet:
+                    print(f"Downloaded: {result.filepath}")
+            else:
+                failed += 1
+                print(f"Error: {result.url}: {result.error}", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("Cancelled", file=sys.stderr)
+        return 130
+    finally:
+        ingester.close()
+        close_postprocessor()
+        close_resolver()
+        close_metrics()
+        close_library_index()
+
+    if not args.quiet:
+        print(f"{completed} downloaded, {skipped} skipped, {failed} failed", file=sys.stderr)
+        cache = get_track_info_cache_stats()
+        if cache and cache['hits'] + cache['misses']:
+            print(f"Track info cache: {cache['hits']} hits, {cache['misses']} misses "
+                  f"({cache['expired']} expired), {cache['hit_rate']:.0%} hit rate", file=sys.stderr)
+        print_ingest_summary(ingester)
+        if len(pool) > 1:
+            for index, session in enumerate(pool.stats(), 1):
+                print(f"Session {index} ({session['label']}): {session['successes']} ok, "
+                      f"{session['failures']} failed, {session['rate_limited']} rate limited, "
+                      f"{session['success_rate']:.0%} success", file=sys.stderr)
+        if len(resolvers) > 1:
+            for endpoint in resolvers.stats():
+                p99 = f"{endpoint['p99']:.2f}s" if endpoint['p99'] is not None else "n/a"
+                print(f"Resolver {endpoint['name']}: {endpoint['successes']} ok, "
+                      f"{endpoint['failures']} failed, {endpoint['hedges']} hedged, p99 {p99}",
+                      file=sys.stderr)
+    return 1 if failed else 0
+
+def run_daemon(args, cookies, jobs, connections, ingester):
+    daemon = DownloadDaemon(
+        output_dir=args.output,
+        max_workers=jobs,
+        segments=connections,
+        cookies=cookies,
+        use_cache=not args.no_cache,
+        skip_existing=not args.no_skip,
+        expand=not args.no_expand,
+        allow_any_output_dir=args.allow_any_output_dir
+    )
+    resumed = daemon.start()
+    try:
+        port = daemon.serve(port=args.port)
+        for url in iter_urls(args.urls, args.input, ingester):
+            daemon.submit(url)
+        ingester.close()
+        if not args.quiet:
+            print(f"Daemon listening on http://127.0.0.1:{port} ({resumed} unfinished jobs resumed)",
+                  file=sys.stderr)
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        if not args.quiet:
+            print("Stopping daemon...", file=sys.stderr)
+    finally:
+        ingester.close()
+        daemon.stop()
+        close_postprocessor()
+        close_resolver()
+        close_metrics()
+        close_library_index()
+    return 0
@@ -0,0 +1,94 @@
+APP_NAME = "SoundCloudGoPlusDownloader"
+DEFAULT_COOKIES = "PHPSESSID=qse7m9ski4k1sqiefelojpv5pq"
+COOKIE_SEPARATOR = "|"
+COOKIE_ATTEMPTS = 3
+COOKIE_COOLDOWN = 30.0
+COOKIE_MAX_COOLDOWN = 600.0
+COOKIE_FAILURE_STATUSES = (401, 403, 429)
+REQUEST_TIMEOUT = 30
+
+SCINFO_URL = "https://scloudplaylistdownloadermp3.com/api/scinfo.php"
+RESOLVER_ENDPOINTS = (SCINFO_URL,)
+RESOLVE_HEDGE_PERCENTILE = 0.95
+RESOLVE_HEDGE_DEFAULT_DELAY = 2.0
+RESOLVE_HEDGE_MIN_DELAY = 0.25
+RESOLVE_HEDGE_MIN_SAMPLES = 20
+RESOLVE_HEDGE_WORKERS = 16
+RESOLVE_LATENCY_SAMPLES = 200
+RESOLVE_ENDPOINT_COOLDOWN = 10.0
+RESOLVE_ENDPOINT_MAX_COOLDOWN = 300.0
+API_HEADERS = {
+    "Accept": "application/json, text/javascript, */*; q=0.01",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36",
+    "Origin": "https://scloudplaylistdownloadermp3.com",
+    "Referer": "https://scloudplaylistdownloadermp3.com/"
+}
+
+DEFAULT_MAX_DOWNLOADS = 3
+MAX_DOWNLOADS_LIMIT = 16
+DEFAULT_DOWNLOAD_SEGMENTS = 4
+MAX_DOWNLOAD_SEGMENTS = 16
+MIN_SEGMENT_SIZE = 1024 * 1024
+DOWNLOAD_MIN_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_MAX_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_CHUNK_TARGET = 0.1
+PROGRESS_INTERVAL = 0.5
+PART_SUFFIX = ".part"
+STATE_SUFFIX = ".part.json"
+DOWNLOAD_RETRIES = 5
+DOWNLOAD_BACKOFF_BASE = 1.0
+DOWNLOAD_BACKOFF_MAX = 30.0
+DOWNLOAD_LINK_REFRESHES = 2
+LINK_EXPIRED_STATUSES = (401, 403, 410)
+LINK_REFRESH_MARGIN = 60
+
+METRICS_PREFIX = "scgp"
+METRICS_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+HTTP_POOL_CONNECTIONS = 10
+HTTP_POOL_MAXSIZE = 16
+HTTP_HOST_POOL_SIZES = {
+    "https://scloudplaylistdownloadermp3.com/": 4,
+    "https://raw.githubusercontent.com/": 1,
+}
+HTTP_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_STATUSES = (500, 502, 503, 504)
+HOST_LIMITS = {
+    "scloudplaylistdownloadermp3.com": {'connections': 4, 'rate': 4.0},
+}
+MIN_THROTTLED_CHUNK_SIZE = 16 * 1024
+LIMIT_WAIT_INTERVAL = 0.1
+
+ARTWORK_CACHE_MAX_MB = 64
+TRACK_INFO_TTL = 30 * 60
+TRACK_INFO_EXPIRY_MARGIN = 5 * 60
+LINK_EXPIRY_PARAMS = ("expires", "expire", "exp", "e")
+
+SOURCE_URL_TAG = "----:com.apple.iTunes:SOURCE_URL"
+HASH_PIECE_SIZE = 1024 * 1024
+MP4_REQUIRED_ATOMS = ("ftyp", "moov", "mdat")
+MP4_PROBE_SIZE = 64 * 1024
+
+SOUNDCLOUD_URL = "https://soundcloud.com/"
+SOUNDCLOUD_API_URL = "https://api-v2.soundcloud.com"
+SOUNDCLOUD_SHORT_LINK_HOSTS = ("on.soundcloud.com", "soundcloud.app.goo.gl")
+SOUNDCLOUD_RESERVED_PATHS = ("discover", "search", "stream", "you", "upload", "charts",
+                             "settings", "messages", "notifications", "pages", "terms-of-use")
+PLAYLIST_BATCH_SIZE = 50
+USER_TRACKS_PAGE_SIZE = 50
+DEFAULT_RESOLVE_WORKERS = 4
+
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 8765
+DAEMON_EVENT_QUEUE_SIZE = 1000
+DAEMON_HEARTBEAT = 15.0
+DAEMON_LOCAL_HOSTS = ("127.0.0.1", "localhost", "[::1]")
+DAEMON_MAX_LIST_LIMIT = 5000
+
+INGEST_MEMORY_LIMIT = 250000
+INGEST_BATCH_SIZE = 500
+
+POSTPROCESS_WORKERS = 2
+POSTPROCESS_COVER_QUALITY = 85
+POSTPROCESS_WAIT_INTERVAL = 0.1
@@ -0,0 +1,453 @@
+import os
+import json
+import time
+import queue
+import sqlite3
+import threading
+from urllib.parse import urlsplit, parse_qs
+
+from .constants import (DEFAULT_COOKIES, DEFAULT_MAX_DOWNLOADS, DEFAULT_DOWNLOAD_SEGMENTS,
+                        DAEMON_HOST, DAEMON_PORT, DAEMON_EVENT_QUEUE_SIZE, DAEMON_HEARTBEAT,
+                        DAEMON_LOCAL_HOSTS, DAEMON_MAX_LIST_LIMIT, INGEST_BATCH_SIZE)
+from .cache import get_cache_dir
+from .downloader import DownloadCancelled
+from .engine import DownloadTask, resolve_with_metrics
+from .library import get_library_index
+from .playlist import expand_url
+from .urls import get_collection_kind, is_short_link, normalize_soundcloud_url
+from .ingest import resolve_short_link
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+JOB_COLUMNS = ("id", "url", "output_dir", "state", "progress", "status", "title", "filepath",
+               "error", "parent_id", "created_at", "updated_at")
+
+class JobStore:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_cache_dir(), "jobs.sqlite3")
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT NOT NULL, output_dir TEXT NOT NULL, "
+                "state TEXT NOT NULL, progress INTEGER NOT NULL DEFAULT 0, status TEXT, title TEXT, "
+                "filepath TEXT, error TEXT, parent_id INTEGER, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id)")
+
+    def _row_to_job(self, row):
+        return dict(zip(JOB_COLUMNS, row)) if row else None
+
+    def add(self, url, output_dir, parent_id=None):
+        now = time.time()
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT INTO jobs (url, output_dir, state, status, parent_id, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, output_dir, JOB_QUEUED, "Queued", parent_id, now, now)
+            )
+            job_id = cursor.lastrowid
+        return self.get(job_id)
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return self._row_to_job(row)
+
+    def list(self, state=None, after_id=0, limit=500):
+        query = f"SELECT {', '.join(JOB_COLUMNS)} FROM jobs WHERE id > ?"
+        params = [after_id]
+        if state:
+            query += " AND state = ?"
+            params.append(state)
+        query += " ORDER BY id LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def update(self, job_id, **fields):
+        fields['updated_at'] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+        return self.get(job_id)
+
+    def claim_next(self):
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT id FROM jobs WHERE state = ? ORDER BY id LIMIT 1", (JOB_QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._connection.execute(
+                "UPDATE jobs SET state = ?, status = ?, updated_at = ? WHERE id = ?",
+                (JOB_RUNNING, "Starting...", time.time(), row[0])
+            )
+        return self.get(row[0])
+
+    def requeue_running(self):
+        with self._lock, self._connection:
+            return self._connection.execute(
+                "UPDATE jobs SET state = ?, status = ?, updated_at = ? WHERE state = ?",
+                (JOB_QUEUED, "Resuming...", time.time(), JOB_RUNNING)
+            ).rowcount
+
+    def child_urls(self, parent_id):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT url FROM jobs WHERE parent_id = ?", (parent_id,)).fetchall()
+        return {row[0] for row in rows}
+
+    def counts(self):
+        with self._lock:
+            rows = self._connection.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+class EventBus:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+
+    def subscribe(self):
+        subscriber = queue.Queue(maxsize=DAEMON_EVENT_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                pass
+
+class DownloadDaemon:
+    def __init__(self, store=None, output_dir=None, max_workers=DEFAULT_MAX_DOWNLOADS,
+                 segments=DEFAULT_DOWNLOAD_SEGMENTS, cookies=DEFAULT_COOKIES, use_cache=True,
+                 skip_existing=True, expand=True, allow_any_output_dir=False):
+        self.store = store or JobStore()
+        self.output_dir = output_dir
+        self.allow_any_output_dir = allow_any_output_dir
+        self.max_workers = max(1, max_workers)
+        self.segments = segments
+        self.cookies = cookies
+        self.use_cache = use_cache
+        self.skip_existing = skip_existing
+        self.expand = expand
+        self.events = EventBus()
+        self._stop_event = threading.Event()
+        self._wakeup = threading.Condition()
+        self._cancelled = set()
+        self._cancelled_lock = threading.Lock()
+        self._workers = []
+        self._server = None
+
+    def start(self):
+        resumed = self.store.requeue_running()
+        for _ in range(self.max_workers):
+            worker = threading.Thread(target=self._work, daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        return resumed
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for worker in self._workers:
+            worker.join(timeout)
+        self.store.close()
+
+    def resolve_output_dir(self, output_dir):
+        if not output_dir:
+            return self.output_dir
+        if self.allow_any_output_dir:
+            return os.path.abspath(output_dir)
+        if not self.output_dir:
+            raise ValueError("This daemon does not accept an output_dir")
+
+        root = os.path.realpath(self.output_dir)
+        path = os.path.realpath(os.path.join(root, output_dir))
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError(f"output_dir must be inside {root}")
+        return path
+
+    def submit(self, url, output_dir=None, parent_id=None):
+        job = self.store.add(url, output_dir or self.output_dir, parent_id)
+        self._publish(job)
+        with self._wakeup:
+            self._wakeup.notify()
+        return job
+
+    def cancel(self, job_id):
+        job = self.store.get(job_id)
+        if not job or job['state'] in FINISHED_STATES:
+            return job
+        if job['state'] == JOB_QUEUED:
+            job = self.store.update(job_id, state=JOB_CANCELLED, status="Cancelled")
+            self._publish(job)
+            return job
+        with self._cancelled_lock:
+            self._cancelled.add(job_id)
+        return job
+
+    def retry(self, job_id):
+        job = self.store.get(job_id)
+        if not job or job['state'] not in (JOB_FAILED, JOB_CANCELLED):
+            return job
+        job = self.store.update(job_id, state=JOB_QUEUED, progress=0, status="Queued", error=None)
+        self._publish(job)
+        with self._wakeup:
+            self._wakeup.notify()
+        return job
+
+    def _publish(self, job):
+        self.events.publish({'event': 'job', 'job': job})
+
+    def _is_cancelled(self, job_id):
+        if self._stop_event.is_set():
+            return True
+        with self._cancelled_lock:
+            return job_id in self._cancelled
+
+    def _work(self):
+        while not self._stop_event.is_set():
+            job = self.store.claim_next()
+            if job is None:
+                with self._wakeup:
+                    self._wakeup.wait(DAEMON_HEARTBEAT)
+                continue
+            self._publish(job)
+            self._run_job(job)
+
+    def _run_job(self, job):
+        job_id = job['id']
+        last_progress = [job['progress']]
+
+        def on_progress(value):
+            if value != last_progress[0]:
+                last_progress[0] = value
+                self._publish(self.store.update(job_id, progress=value))
+
+        def on_status(status):
+            self.events.publish({'event': 'status', 'id': job_id, 'status': status})
+
+        try:
+            job_url = job['url']
+            if is_short_link(job_url):
+                job_url = normalize_soundcloud_url(resolve_short_link(job_url))
+
+            if self.expand and get_collection_kind(job_url):
+                known = self.store.child_urls(job_id)
+                count = len(known)
+                for url in expand_url(job_url):
+                    if self._is_cancelled(job_id):
+                        raise DownloadCancelled("Download cancelled")
+                    if url not in known:
+                        self.submit(url, job['output_dir'], parent_id=job_id)
+                        known.add(url)
+                        count += 1
+                self._finish(job_id, JOB_COMPLETED, f"Expanded into {count} tracks", progress=100)
+                return
+
+            existing = get_library_index().get(job_url) if self.skip_existing else None
+            if existing:
+                self._finish(job_id, JOB_COMPLETED, "Already downloaded", progress=100,
+                             filepath=existing['filepath'])
+                return
+
+            on_status("Fetching track information...")
+            track_info, metrics = resolve_with_metrics(job_url, self.cookies, self.use_cache)
+            self._publish(self.store.update(job_id, title=track_info.get('name')))
+
+            task = DownloadTask(track_info, job['output_dir'], self.segments,
+                                on_progress=on_progress, on_status=on_status,
+                                is_cancelled=lambda: self._is_cancelled(job_id),
+                                metrics=metrics, url=job_url, cookies=self.cookies)
+            filepath = task.run()
+            self._finish(job_id, JOB_COMPLETED, "Download completed!", progress=100, filepath=filepath)
+        except DownloadCancelled:
+            if self._stop_event.is_set():
+                self._publish(self.store.update(job_id, state=JOB_QUEUED, status="Interrupted"))
+            else:
+                self._finish(job_id, JOB_CANCELLED, "Cancelled")
+        except Exception as e:
+            self._finish(job_id, JOB_FAILED, "Failed", error=str(e))
+        finally:
+            with self._cancelled_lock:
+                self._cancelled.discard(job_id)
+
+    def _finish(self, job_id, state, status, **fields):
+        self._publish(self.store.update(job_id, state=state, status=status, **fields))
+
+    def serve(self, host=DAEMON_HOST, port=DAEMON_PORT):
+        from http.server import ThreadingHTTPServer
+
+        self._server = ThreadingHTTPServer((host, port), _create_handler(self))
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address[1]
+
+def _create_handler(daemon):
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, data, status=200):
+            body = json.dumps(data).encode('utf-8')
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length) if length > 0 else b""
+            content_type = self.headers.get("Content-Type", "").split(';')[0].strip().lower()
+            if content_type != "application/json":
+                raise ValueError("Content-Type must be application/json")
+            data = json.loads(body.decode('utf-8')) if body else {}
+            if not isinstance(data, dict):
+                raise ValueError("Expected a JSON object")
+            return data
+
+        def _is_local_request(self):
+            host, port = self.server.server_address[:2]
+            allowed = {f"{name}:{port}" for name in DAEMON_LOCAL_HOSTS + (host,)}
+            if self.headers.get("Host", "").lower() not in allowed:
+                return False
+            origin = self.headers.get("Origin")
+            return origin is None or origin.lower() in {f"http://{host}" for host in allowed}
+
+        def _query_int(self, query, name, default):
+            value = query.get(name, [str(default)])[0]
+            if not value.isdigit():
+                raise ValueError(f"{name} must be a non-negative integer")
+            return int(value)
+
+        def _route(self):
+            parts = urlsplit(self.path)
+            return [part for part in parts.path.split('/') if part], parse_qs(parts.query)
+
+        def do_GET(self):
+            if not self._is_local_request():
+                return self._send_json({'error': "Forbidden"}, 403)
+            path, query = self._route()
+            if path == ["health"]:
+                return self._send_json({'status': 'ok', 'jobs': daemon.store.counts()})
+            if path == ["jobs"]:
+                try:
+                    after_id = self._query_int(query, 'after', 0)
+                    limit = min(self._query_int(query, 'limit', 500), DAEMON_MAX_LIST_LIMIT)
+                except ValueError as e:
+                    return self._send_json({'error': str(e)}, 400)
+                jobs = daemon.store.list(state=query.get('state', [None])[0], after_id=after_id,
+                                         limit=limit)
+                return self._send_json({'jobs': jobs})
+            if len(path) == 2 and path[0] == "jobs" and path[1].isdigit():
+                job = daemon.store.get(int(path[1]))
+                return self._send_json({'job': job} if job else {'error': "Job not found"},
+                                       200 if job else 404)
+            if path == ["events"]:
+                return self._stream_events()
+            self._send_json({'error': "Not found"}, 404)
+
+        def do_POST(self):
+            if not self._is_local_request():
+                return self._send_json({'error': "Forbidden"}, 403)
+            path, _ = self._route()
+            try:
+                data = self._read_json()
+            except ValueError as e:
+                return self._send_json({'error': f"Invalid request: {str(e)}"}, 400)
+
+            if path == ["jobs"]:
+                urls = data.get('urls') or ([data['url']] if data.get('url') else [])
+                if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+                    return self._send_json({'error': "urls must be a list of strings"}, 400)
+                if not urls:
+                    return self._send_json({'error': "No URLs given"}, 400)
+                try:
+                    output_dir = daemon.resolve_output_dir(data.get('output_dir'))
+                except (ValueError, TypeError) as e:
+                    return self._send_json({'error': str(e)}, 400)
+                jobs = [daemon.submit(url, output_dir) for url in urls]
+                return self._send_json({'jobs': jobs}, 201)
+            if len(path) == 3 and path[0] == "jobs" and path[1].isdigit() and path[2] in ("cancel", "retry"):
+                action = daemon.cancel if path[2] == "cancel" else daemon.retry
+                job = action(int(path[1]))
+                return self._send_json({'job': job} if job else {'error': "Job not found"},
+                                       200 if job else 404)
+            self._send_json({'error': "Not found"}, 404)
+
+        def _stream_events(self):
+            subscriber = daemon.events.subscribe()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            try:
+                while not daemon._stop_event.is_set():
+                    try:
+                        event = subscriber.get(timeout=DAEMON_HEARTBEAT)
+                        self.wfile.write(f"data: {json.dumps(event)}\n\n".encode('utf-8'))
+                    except queue.Empty:
+                        self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+            except OSError:
+                pass
+            finally:
+                daemon.events.unsubscribe(subscriber)
+
+    return Handler
+
+def _post_jobs(urls, output_dir, host, port):
+    from .network import get_http_client
+
+    payload = {'urls': urls}
+    if output_dir:
+        payload['output_dir'] = output_dir
+    response = get_http_client().post(f"http://{host}:{port}/jobs", json=payload)
+    response.raise_for_status()
+    return response.json()['jobs']
+
+def submit_to_daemon(urls, output_dir=None, host=DAEMON_HOST, port=DAEMON_PORT,
+                     batch_size=INGEST_BATCH_SIZE):
+    batch = []
+    for url in urls:
+        batch.append(url)
+        if len(batch) >= batch_size:
+            yield from _post_jobs(batch, output_dir, host, port)
+            batch = []
+    if batch:
+        yield from _post_jobs(batch, output_dir, host, port)
@@ -0,0 +1,500 @@
+import os
+import json
+import hashlib
+import time
+import random
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
+
+from .constants import (DEFAULT_DOWNLOAD_SEGMENTS, MAX_DOWNLOAD_SEGMENTS, MIN_SEGMENT_SIZE,
+                        DOWNLOAD_MIN_CHUNK_SIZE, DOWNLOAD_MAX_CHUNK_SIZE, DOWNLOAD_CHUNK_TARGET,
+                        PROGRESS_INTERVAL, PART_SUFFIX, STATE_SUFFIX,
+                        DOWNLOAD_RETRIES, DOWNLOAD_BACKOFF_BASE, DOWNLOAD_BACKOFF_MAX,
+                        DOWNLOAD_LINK_REFRESHES, LINK_EXPIRED_STATUSES, LINK_REFRESH_MARGIN,
+                        HASH_PIECE_SIZE, MP4_PROBE_SIZE)
+from .network import get_http_client
+from .limits import get_bandwidth_limiter
+from .verify import VerifyError, PieceHasher, AudioHasher, content_hash, find_audio
+from .tagging import TagError
+from .urls import get_link_expiry
+
+_claimed_files = {}
+_claimed_files_condition = threading.Condition()
+
+class IncompleteDownloadError(Exception):
+    pass
+
+class DownloadCancelled(Exception):
+    pass
+
+def format_file_size(size_bytes):
+    if size_bytes == 0:
+        return "0B"
+    size_names = ["B", "KB", "MB", "GB"]
+    i = 0
+    while size_bytes >= 1024 and i < len(size_names) - 1:
+        size_bytes /= 1024.0
+        i += 1
+    return f"{size_bytes:.1f}{size_names[i]}"
+
+class Downloader:
+    def __init__(self, segments=DEFAULT_DOWNLOAD_SEGMENTS, on_progress=None, on_status=None,
+                 is_cancelled=None, metrics=None):
+        self.segments = max(1, min(segments, MAX_DOWNLOAD_SEGMENTS))
+        self.on_progress = on_progress
+        self.on_status = on_status
+        self.metrics = metrics
+        self.bytes_received = 0
+        self.file_size = None
+        self.audio_hash = None
+        self.audio = None
+        self.pieces = {}
+        self._started = None
+        self._cancel_check = is_cancelled
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set() or bool(self._cancel_check and self._cancel_check())
+
+    def _report_progress(self, downloaded, file_size, speed_bps):
+        if self.on_progress:
+            self.on_progress(downloaded, file_size, speed_bps)
+
+    def _emit_status(self, status):
+        if self.on_status:
+            self.on_status(status)
+
+    def _mark_first_byte(self):
+        if self.metrics and self.metrics.time_to_first_byte is None:
+            self.metrics.time_to_first_byte = time.perf_counter() - self._started
+
+    def _probe_download(self, url):
+        headers = {"Range": f"bytes=0-{MP4_PROBE_SIZE - 1}"}
+        with get_http_client().get(url, headers=headers, stream=True) as response:
+            response.raise_for_status()
+            content_range = response.headers.get('content-range', '')
+            if response.status_code != 206 or '/' not in content_range:
+                return int(response.headers.get('content-length', 0)), False, b''
+
+            total = content_range.rsplit('/', 1)[1].strip()
+            if not total.isdigit():
+                return 0, False, b''
+            return int(total), True, response.content
+
+    def _find_audio(self, url, file_size, head):
+        def read(offset, count):
+            if offset + count <= len(head):
+                return head[offset:offset + count]
+            headers = {"Range": f"bytes={offset}-{offset + count - 1}"}
+            with get_http_client().get(url, headers=headers) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise Exception(f"Server ignored range request for bytes {offset}-{offset + count - 1}")
+                return response.content
+
+        return list(find_audio(read, file_size))
+
+    def _is_transient_error(self, error):
+        import requests
+
+        if isinstance(error, IncompleteDownloadError):
+            return True
+        if isinstance(error, requests.exceptions.HTTPError):
+            status = error.response.status_code if error.response is not None else None
+            return status is None or status == 429 or status >= 500
+        return isinstance(error, (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+            requests.exceptions.ChunkedEncodingError
+        ))
+
+    def _is_link_expired(self, url):
+        expiry = get_link_expiry(url)
+        return expiry is not None and expiry - LINK_REFRESH_MARGIN <= time.time()
+
+    def _is_link_error(self, error):
+        import requests
+
+        if not isinstance(error, requests.exceptions.HTTPError) or error.response is None:
+            return False
+        return error.response.status_code in LINK_EXPIRED_STATUSES
+
+    def _refresh_link(self, refresh_url):
+        self._emit_status("Download link expired, refreshing...")
+        try:
+            return refresh_url()
+        except DownloadCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"Download link expired and could not be refreshed: {str(e)}") from e
+
+    def _is_request_error(self, error):
+        import requests
+
+        return isinstance(error, requests.exceptions.RequestException)
+
+    def _wait_before_retry(self, attempt, error):
+        delay = min(DOWNLOAD_BACKOFF_MAX, DOWNLOAD_BACKOFF_BASE * (2 ** attempt))
+        delay *= random.uniform(0.5, 1.0)
+        self._emit_status(
+            f"Connection problem, retrying in {delay:.0f}s ({attempt + 1}/{DOWNLOAD_RETRIES})...")
+
+        deadline = time.time() + delay
+        while time.time() < deadline:
+            if self.is_cancelled():
+                raise DownloadCancelled("Download cancelled")
+            time.sleep(0.1)
+
+    @contextmanager
+    def claim_file(self, filepath):
+        key = os.path.normcase(os.path.abspath(filepath))
+        with _claimed_files_condition:
+            owner = _claimed_files.get(key)
+        nested = owner is self
+        waited = owner is not None and not nested
+        if waited:
+            self._emit_status("Waiting for another download of the same file...")
+
+        with _claimed_files_condition:
+            while not nested and key in _claimed_files:
+                if self.is_cancelled():
+                    raise DownloadCancelled("Download cancelled")
+                _claimed_files_condition.wait(0.1)
+            _claimed_files[key] = self
+        try:
+            yield waited
+        finally:
+            if not nested:
+                with _claimed_files_condition:
+                    del _claimed_files[key]
+                    _claimed_files_condition.notify_all()
+
+    def download(self, url, filepath, before_replace=None, refresh_url=None):
+        with self.claim_file(filepath):
+            return self._download(url, filepath, before_replace, refresh_url)
+
+    def _download(self, url, filepath, before_replace=None, refresh_url=None):
+        part_path = filepath + PART_SUFFIX
+        state_path = filepath + STATE_SUFFIX
+
+        self._started = time.perf_counter()
+        if refresh_url and self._is_link_expired(url):
+            url = self._refresh_link(refresh_url)
+
+        attempt = 0
+        refreshes = 0
+        while True:
+            bytes_before = self.bytes_received
+            try:
+                file_size = self._transfer(url, part_path, state_path)
+                break
+            except Exception as e:
+                if self.bytes_received > bytes_before:
+                    attempt = 0
+                    refreshes = 0
+                if (refresh_url and not self.is_cancelled() and self._is_link_error(e)
+                        and refreshes < DOWNLOAD_LINK_REFRESHES):
+                    if self.metrics:
+                        self.metrics.add_retry(e)
+                    url = self._refresh_link(refresh_url)
+                    refreshes += 1
+                    continue
+                if self.is_cancelled() or not self._is_transient_error(e):
+                    if self._is_request_error(e):
+                        raise Exception(f"Download failed: {str(e)}") from e
+                    raise
+                if attempt >= DOWNLOAD_RETRIES:
+                    raise Exception(f"Download failed after {DOWNLOAD_RETRIES} retries: {str(e)}") from e
+                if self.metrics:
+                    self.metrics.add_retry(e)
+                self._wait_before_retry(attempt, e)
+                attempt += 1
+
+        actual_size = os.path.getsize(part_path)
+        if file_size and actual_size != file_size:
+            self._remove_state(state_path)
+            raise Exception(f"Download failed: expected {file_size} bytes, got {actual_size}")
+        self.file_size = actual_size
+        self.audio_hash = content_hash(self.pieces, self.audio[1] - self.audio[0])
+
+        if before_replace:
+            try:
+                before_replace(part_path)
+            except (TagError, VerifyError):
+                self._remove_state(state_path)
+                raise
+
+        os.replace(part_path, filepath)
+        self._remove_state(state_path)
+        return True
+
+    def _transfer(self, url, part_path, state_path):
+        file_size, accepts_ranges, head = self._probe_download(url)
+
+        if not accepts_ranges or file_size <= 0:
+            self._remove_state(state_path)
+            self.pieces = {}
+            return self._download_single(url, part_path)
+
+        audio = self._find_audio(url, file_size, head)
+        state = self._load_state(state_path, file_size, audio)
+        if state is None or not os.path.exists(part_path):
+            state = {'url': url, 'size': file_size, 'piece_size': HASH_PIECE_SIZE, 'audio': audio,
+                     'segments': self._split_segments(file_size, audio[0]), 'pieces': {}}
+            with open(part_path, 'wb') as f:
+                self._preallocate(f, file_size)
+        else:
+            state['url'] = url
+            self._verify_pieces(part_path, state)
+        self._save_state(state_path, state)
+
+        self.audio = audio
+        self.pieces = state['pieces']
+        self._download_ranges(url, part_path, state_path, state)
+
+        downloaded = sum(segment[2] for segment in state['segments'])
+        if downloaded != file_size:
+            raise IncompleteDownloadError(f"Only {downloaded} of {file_size} bytes were received")
+        return file_size
+
+    def _load_state(self, state_path, file_size, audio):
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (state.get('size') != file_size or not state.get('segments')
+                or state.get('piece_size') != HASH_PIECE_SIZE or state.get('audio') != audio):
+            return None
+
+        state['pieces'] = {int(index): digest for index, digest in state.get('pieces', {}).items()}
+        return state
+
+    def _verify_pieces(self, part_path, state):
+        start, end = state['audio']
+        pieces = state['pieces']
+        checked = False
+        with open(part_path, 'rb') as f:
+            for segment in state['segments']:
+                done_end = segment[0] + segment[2]
+                piece_start = max(segment[0], start)
+                while piece_start < min(done_end, end):
+                    piece_end = min(piece_start + HASH_PIECE_SIZE, end)
+                    if piece_end > done_end:
+                        break
+                    if not checked:
+                        self._emit_status("Checking partial download...")
+                        checked = True
+                    index = (piece_start - start) // HASH_PIECE_SIZE
+                    f.seek(piece_start)
+                    if pieces.get(index) != hashlib.sha256(f.read(piece_end - piece_start)).hexdigest():
+                        segment[2] = piece_start - segment[0]
+                        break
+                    piece_start = piece_end
+
+    def _save_state(self, state_path, state):
+        temp_path = state_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, state_path)
+
+    def _remove_state(self, state_path):
+        try:
+            os.remove(state_path)
+        except FileNotFoundError:
+            pass
+
+    def _preallocate(self, f, size):
+        if size > 0 and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+                return
+            except OSError:
+                pass
+        f.truncate(size)
+
+    def _next_chunk_size(self, chunk_size, count, elapsed):
+        if count == chunk_size and elapsed < DOWNLOAD_CHUNK_TARGET:
+            return min(chunk_size * 2, DOWNLOAD_MAX_CHUNK_SIZE)
+        if elapsed > DOWNLOAD_CHUNK_TARGET * 2:
+            return max(chunk_size // 2, DOWNLOAD_MIN_CHUNK_SIZE)
+        return chunk_size
+
+    def _read_chunk(self, raw, size):
+        import requests
+        from urllib3.exceptions import ProtocolError, ReadTimeoutError, SSLError
+
+        try:
+            return raw.read(size)
+        except ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        except ReadTimeoutError as e:
+            raise requests.exceptions.ConnectionError(e)
+        except SSLError as e:
+            raise requests.exceptions.SSLError(e)
+
+    def _iter_chunks(self, response, length=None):
+        if response.headers.get('content-encoding', 'identity').lower() != 'identity':
+            yield from response.iter_content(chunk_size=DOWNLOAD_MAX_CHUNK_SIZE)
+            return
+
+        chunk_size = DOWNLOAD_MIN_CHUNK_SIZE
+        remaining = length
+        while remaining is None or remaining > 0:
+            size = chunk_size if remaining is None else min(chunk_size, remaining)
+            limit = get_bandwidth_limiter().chunk_limit()
+            if limit:
+                size = min(size, limit)
+            started = time.monotonic()
+            chunk = self._read_chunk(response.raw, size)
+            if not chunk:
+                return
+            yield chunk
+            count = len(chunk)
+            if remaining is not None:
+                remaining -= count
+            chunk_size = self._next_chunk_size(chunk_size, count, time.monotonic() - started)
+
+    def _copy_to_file(self, response, f, length, on_data, hasher, abort=None):
+        limiter = get_bandwidth_limiter()
+        for chunk in self._iter_chunks(response, length):
+            if self.is_cancelled():
+                raise DownloadCancelled("Download cancelled")
+            if abort is not None and abort.is_set():
+                return
+            self._mark_first_byte()
+            f.write(chunk)
+            hasher.update(chunk)
+            on_data(len(chunk))
+            limiter.consume(len(chunk), self.is_cancelled)
+
+    def _download_single(self, url, part_path):
+        with get_http_client().get(url, stream=True) as response:
+            response.raise_for_status()
+
+            file_size = int(response.headers.get('content-length', 0))
+            received = [0]
+            lock = threading.Lock()
+            hasher = AudioHasher(on_piece=self.pieces.__setitem__)
+
+            def on_data(count):
+                with lock:
+                    received[0] += count
+                    self.bytes_received += count
+
+            with open(part_path, 'wb', buffering=0) as f:
+                self._preallocate(f, file_size)
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    future = executor.submit(self._copy_to_file, response, f, file_size or None,
+                                             on_data, hasher)
+                    self._wait_with_progress([future], file_size, lambda: received[0])
+        hasher.finish()
+        self.audio = [hasher.start, hasher.end]
+
+        downloaded = received[0]
+        if file_size and downloaded != file_size:
+            raise IncompleteDownloadError(f"Connection closed after {downloaded} of {file_size} bytes")
+        return file_size
+
+    def _split_segments(self, file_size, origin=0):
+        count = max(1, min(self.segments, file_size // MIN_SEGMENT_SIZE))
+        segment_size = -(-file_size // count)
+        segment_size += -segment_size % HASH_PIECE_SIZE
+        bounds = [0] + list(range(origin + segment_size, file_size, segment_size)) + [file_size]
+        return [[start, end - 1, 0] for start, end in zip(bounds, bounds[1:])]
+
+    def _download_segment(self, url, part_path, segment, pieces, audio, lock, abort):
+        start, end, done = segment
+        position = start + done
+        if position > end:
+            return
+
+        def on_data(count):
+            with lock:
+                segment[2] += count
+                self.bytes_received += count
+
+        def on_piece(index, digest):
+            with lock:
+                pieces[index] = digest
+
+        audio_start, audio_end = audio
+        piece_start = position
+        if audio_start < position < audio_end:
+            piece_start -= (position - audio_start) % HASH_PIECE_SIZE
+        hasher = PieceHasher(piece_start, on_piece, audio_start, audio_end)
+
+        headers = {"Range": f"bytes={position}-{end}"}
+        with get_http_client().get(url, headers=headers, stream=True) as response:
+            response.raise_for_status()
+            if response.status_code != 206:
+                raise Exception(f"Server ignored range request for bytes {position}-{end}")
+
+            with open(part_path, 'r+b', buffering=0) as f:
+                if piece_start < position:
+                    f.seek(piece_start)
+                    hasher.update(f.read(position - piece_start))
+                f.seek(position)
+                self._copy_to_file(response, f, end + 1 - position, on_data, hasher, abort)
+
+        position = start + segment[2]
+        if position <= end:
+            if not abort.is_set():
+                raise IncompleteDownloadError(f"Connection closed at byte {position} of range {start}-{end}")
+            return
+        hasher.finish()
+
+    def _wait_with_progress(self, futures, file_size, get_downloaded, on_tick=None, abort=None):
+        last_time = time.monotonic()
+        last_downloaded = get_downloaded()
+
+        pending = futures
+        while pending:
+            done, pending = wait(pending, timeout=PROGRESS_INTERVAL, return_when=FIRST_EXCEPTION)
+            for future in done:
+                if future.exception():
+                    if abort is not None:
+                        abort.set()
+                    raise future.exception()
+
+            if on_tick:
+                on_tick()
+            downloaded = get_downloaded()
+            current_time = time.monotonic()
+            time_diff = current_time - last_time
+            if time_diff > 0:
+                speed_bps = (downloaded - last_downloaded) / time_diff
+                self._report_progress(downloaded, file_size, speed_bps)
+                last_time = current_time
+                last_downloaded = downloaded
+
+    def _download_ranges(self, url, part_path, state_path, state):
+        segments = state['segments']
+        file_size = state['size']
+        lock = threading.Lock()
+        abort = threading.Event()
+
+        remaining = [segment for segment in segments if segment[0] + segment[2] <= segment[1]]
+
+        def get_downloaded():
+            with lock:
+                return sum(segment[2] for segment in segments)
+
+        def save_state():
+            with lock:
+                self._save_state(state_path, state)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, len(remaining))) as executor:
+                futures = [
+                    executor.submit(self._download_segment, url, part_path, segment, state['pieces'],
+                                    state['audio'], lock, abort)
+                    for segment in remaining
+                ]
+                self._wait_with_progress(futures, file_size, get_downloaded, save_state, abort)
+        finally:
+            save_state()
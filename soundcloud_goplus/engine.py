@@ -0,0 +1,265 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .constants import (DEFAULT_COOKIES, DEFAULT_DOWNLOAD_SEGMENTS, DEFAULT_MAX_DOWNLOADS,
+                        DEFAULT_RESOLVE_WORKERS)
+from .downloader import Downloader, format_file_size
+from .library import get_library_index
+from .metrics import JobMetrics, get_metrics
+from .playlist import expand_url
+from .resolver import resolve_track, refresh_track_info
+from .tagging import TagError, fetch_cover
+from .postprocess import get_postprocessor
+from .verify import check_mp4
+from .ingest import SeenUrls
+from .urls import normalize_soundcloud_url
+
+def create_safe_filename(track_info):
+    artist = track_info.get('artist', 'Unknown')
+    name = track_info.get('name', 'Unknown')
+    filename = f"{artist} - {name}.m4a"
+    return "".join(c for c in filename if c.isalnum() or c in (' ', '-', '_', '.')).rstrip()
+
+class DownloadTask:
+    def __init__(self, track_info, output_dir, segments=DEFAULT_DOWNLOAD_SEGMENTS,
+                 on_progress=None, on_status=None, is_cancelled=None, metrics=None, url=None,
+                 on_speed=None, cookies=DEFAULT_COOKIES, on_resolved=None):
+        self.track_info = track_info
+        self.output_dir = output_dir
+        self.on_progress = on_progress
+        self.on_status = on_status
+        self.on_speed = on_speed
+        self.on_resolved = on_resolved
+        self.cookies = cookies
+        self.metrics = metrics or JobMetrics(url)
+        self.url = url or self.metrics.url
+        self.filepath = os.path.join(output_dir, create_safe_filename(track_info))
+        self.sha256 = None
+        self.downloader = Downloader(
+            segments=segments,
+            on_progress=self._report_download_progress,
+            on_status=self._emit_status,
+            is_cancelled=is_cancelled,
+            metrics=self.metrics
+        )
+
+    def cancel(self):
+        self.downloader.cancel()
+
+    def _emit_progress(self, value):
+        if self.on_progress:
+            self.on_progress(value)
+
+    def _emit_status(self, status):
+        if self.on_status:
+            self.on_status(status)
+
+    def _refresh_link(self):
+        with self.metrics.phase('resolve'):
+            track_info = refresh_track_info(self.url, self.cookies)
+        if not track_info.get('dlink_m4a'):
+            raise Exception("No download link available")
+        self.track_info = track_info
+        if self.on_resolved:
+            self.on_resolved(track_info)
+        return track_info['dlink_m4a']
+
+    def _report_download_progress(self, downloaded, file_size, speed_bps):
+        if self.on_speed:
+            self.on_speed(speed_bps)
+        speed_str = f"{format_file_size(speed_bps)}/s"
+        downloaded_str = format_file_size(downloaded)
+        if file_size <= 0:
+            self._emit_status(f"Downloading... {downloaded_str} ({speed_str})")
+            return
+        self._emit_progress(10 + int((downloaded / file_size) * 70))
+
+        total_str = format_file_size(file_size)
+        self._emit_status(f"Downloading... {downloaded_str} / {total_str} ({speed_str})")
+
+    def run(self):
+        try:
+            self._run()
+        except BaseException as e:
+            self._record(e)
+            raise
+        self._record()
+        return self.filepath
+
+    def _run(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        self._emit_progress(10)
+        self._emit_status("Preparing download...")
+
+        if not self.track_info.get('dlink_m4a'):
+            raise Exception("No download link available")
+
+        with self.downloader.claim_file(self.filepath) as waited:
+            existing = get_library_index().get(self.url) if waited and self.url else None
+            if existing and existing['filepath'] == os.path.abspath(self.filepath):
+                self.sha256 = existing['sha256']
+                self._emit_progress(100)
+                self._emit_status("Already downloaded")
+                return
+            self._download()
+
+    def _download(self):
+        get_postprocessor().start()
+        executor = ThreadPoolExecutor(max_workers=1)
+        cover = executor.submit(self._fetch_cover)
+        executor.shutdown(wait=False)
+
+        download_started = time.perf_counter()
+
+        def tag_part_file(part_path):
+            self.metrics.add_phase('download', time.perf_counter() - download_started)
+            self._emit_progress(80)
+            self._emit_status("Verifying download...")
+            check_mp4(part_path, self.downloader.file_size)
+            self._emit_status("Adding metadata...")
+            with self.metrics.phase('tag'):
+                try:
+                    cover_data = cover.result()
+                except Exception as e:
+                    raise TagError(f"Failed to add metadata: {str(e)}") from e
+                get_postprocessor().process(part_path, self.track_info, self.url, cover_data,
+                                            self.downloader.is_cancelled, self._emit_status)
+
+        try:
+            self.downloader.download(self.track_info['dlink_m4a'], self.filepath,
+                                     before_replace=tag_part_file,
+                                     refresh_url=self._refresh_link if self.url else None)
+        except BaseException:
+            if 'download' not in self.metrics.phases:
+                self.metrics.add_phase('download', time.perf_counter() - download_started)
+            raise
+        self.sha256 = self.downloader.audio_hash
+        if self.url:
+            get_library_index().add(self.url, self.filepath, sha256=self.sha256)
+        self._emit_progress(100)
+        self._emit_status("Download completed!")
+
+    def _fetch_cover(self):
+        with self.metrics.phase('artwork'):
+            return fetch_cover(self.track_info)
+
+    def _record(self, error=None):
+        self.metrics.bytes = self.downloader.bytes_received
+        if error is None:
+            self.metrics.size = os.path.getsize(self.filepath)
+        self.metrics.finish(error)
+        get_metrics().record(self.metrics)
+
+def resolve_with_metrics(url, cookies=DEFAULT_COOKIES, use_cache=True, metrics=None):
+    metrics = metrics or JobMetrics(url)
+    try:
+        with metrics.phase('resolve'):
+            return resolve_track(url, cookies, use_cache), metrics
+    except Exception as e:
+        metrics.finish(e)
+        get_metrics().record(metrics)
+        raise
+
+def download_track(track_info, output_dir, segments=DEFAULT_DOWNLOAD_SEGMENTS,
+                   on_progress=None, on_status=None):
+    task = DownloadTask(track_info, output_dir, segments, on_progress, on_status)
+    return task.run()
+
+def download_url(url, output_dir, cookies=DEFAULT_COOKIES, segments=DEFAULT_DOWNLOAD_SEGMENTS,
+                 use_cache=True, on_progress=None, on_status=None):
+    track_info, metrics = resolve_with_metrics(url, cookies, use_cache)
+    task = DownloadTask(track_info, output_dir, segments, on_progress, on_status, metrics=metrics,
+                        url=url, cookies=cookies)
+    return task.run()
+
+class BatchResult:
+    def __init__(self, url, filepath=None, error=None, skipped=False):
+        self.url = url
+        self.filepath = filepath
+        self.error = error
+        self.skipped = skipped
+
+    @property
+    def ok(self):
+        return self.error is None
+
+def expand_urls(urls):
+    for url in urls:
+        try:
+            yield from expand_url(url)
+        except Exception as e:
+            yield BatchResult(url, error=str(e))
+
+def run_batch(urls, output_dir, max_workers=DEFAULT_MAX_DOWNLOADS, cookies=DEFAULT_COOKIES,
+              segments=DEFAULT_DOWNLOAD_SEGMENTS, use_cache=True, stop_event=None,
+              resolve_workers=DEFAULT_RESOLVE_WORKERS, expand=True, skip_existing=True):
+    stop_event = stop_event or threading.Event()
+    items = expand_urls(urls) if expand else iter(urls)
+    seen = SeenUrls()
+    max_workers = max(1, max_workers)
+    resolve_workers = max(1, resolve_workers)
+
+    def resolve(url):
+        if stop_event.is_set():
+            return url, None, "Cancelled"
+        try:
+            return url, resolve_with_metrics(url, cookies, use_cache), None
+        except Exception as e:
+            return url, None, str(e)
+
+    def download(url, resolved):
+        if stop_event.is_set():
+            return BatchResult(url, error="Cancelled")
+        track_info, metrics = resolved
+        try:
+            task = DownloadTask(track_info, output_dir, segments, is_cancelled=stop_event.is_set,
+                                metrics=metrics, url=url, cookies=cookies)
+            return BatchResult(url, filepath=task.run())
+        except Exception as e:
+            return BatchResult(url, error=str(e))
+
+    with ThreadPoolExecutor(max_workers=resolve_workers) as resolvers, \
+            ThreadPoolExecutor(max_workers=max_workers) as downloaders:
+        resolving = set()
+        downloading = set()
+        exhausted = False
+        try:
+            while resolving or downloading or not exhausted:
+                while (not exhausted and len(resolving) < resolve_workers
+                       and len(resolving) + len(downloading) < max_workers * 2):
+                    item = next(items, None)
+                    if item is None:
+                        exhausted = True
+                    elif isinstance(item, BatchResult):
+                        yield item
+                    elif not seen.add(normalize_soundcloud_url(item)):
+                        continue
+                    else:
+                        existing = get_library_index().get(item) if skip_existing else None
+                        if existing:
+                            yield BatchResult(item, filepath=existing['filepath'], skipped=True)
+                        else:
+                            resolving.add(resolvers.submit(resolve, item))
+
+                if not resolving and not downloading:
+                    break
+                done, _ = wait(resolving | downloading, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in resolving:
+                        resolving.remove(future)
+                        url, resolved, error = future.result()
+                        if error:
+                            yield BatchResult(url, error=error)
+                        else:
+                            downloading.add(downloaders.submit(download, url, resolved))
+                    else:
+                        downloading.remove(future)
+                        yield future.result()
+        except BaseException:
+            stop_event.set()
+            raise
+        finally:
+            seen.close()
@@ -0,0 +1,132 @@
+import os
+import sys
+import hashlib
+import sqlite3
+import tempfile
+import threading
+from urllib.parse import urlsplit
+
+from .constants import INGEST_MEMORY_LIMIT
+from .cache import get_cache_dir
+from .network import get_http_client
+from .urls import extract_soundcloud_urls, is_short_link, normalize_soundcloud_url
+
+def resolve_short_link(url):
+    try:
+        with get_http_client().get(url, stream=True) as response:
+            if response.history and not is_short_link(response.url):
+                return response.url
+    except Exception:
+        pass
+    return url
+
+def canonicalize_url(url, resolve_short_links=True):
+    if resolve_short_links and is_short_link(url):
+        url = resolve_short_link(url)
+    url = normalize_soundcloud_url(url)
+    if urlsplit(url).path == "/":
+        return None
+    return url
+
+class SeenUrls:
+    def __init__(self, memory_limit=INGEST_MEMORY_LIMIT):
+        self.memory_limit = memory_limit
+        self.path = None
+        self._keys = set()
+        self._count = 0
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def _key(self, url):
+        digest = hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big', signed=True)
+
+    def _spill(self):
+        directory = get_cache_dir()
+        os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(prefix="seen-", suffix=".sqlite3", dir=directory)
+        os.close(fd)
+        self._connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=OFF")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        self._connection.execute("CREATE TABLE seen (key INTEGER PRIMARY KEY)")
+        self._connection.executemany("INSERT INTO seen (key) VALUES (?)", ((key,) for key in self._keys))
+        self._keys = set()
+
+    def add(self, url):
+        key = self._key(url)
+        with self._lock:
+            if self._connection is not None:
+                cursor = self._connection.execute("INSERT OR IGNORE INTO seen (key) VALUES (?)", (key,))
+                added = cursor.rowcount == 1
+            else:
+                added = key not in self._keys
+                if added:
+                    self._keys.add(key)
+                    if len(self._keys) > self.memory_limit:
+                        self._spill()
+            if added:
+                self._count += 1
+            return added
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        with self._lock:
+            self._keys = set()
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+
+class UrlIngester:
+    def __init__(self, seen=None, resolve_short_links=True):
+        self.seen = SeenUrls() if seen is None else seen
+        self.resolve_short_links = resolve_short_links
+        self.lines = 0
+        self.accepted = 0
+        self.duplicates = 0
+        self.rejected = 0
+
+    def add(self, url):
+        url = canonicalize_url(url, self.resolve_short_links)
+        if url is None:
+            self.rejected += 1
+            return None
+        return self._accept(url)
+
+    def _accept(self, url):
+        if not self.seen.add(url):
+            self.duplicates += 1
+            return None
+        self.accepted += 1
+        return url
+
+    def feed(self, lines):
+        for line in lines:
+            self.lines += 1
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            urls = extract_soundcloud_urls(line)
+            if not urls:
+                self.rejected += 1
+                continue
+            for url in urls:
+                url = self.add(url) if is_short_link(url) else self._accept(url)
+                if url:
+                    yield url
+
+    def read(self, source):
+        if source == "-":
+            yield from self.feed(sys.stdin)
+            return
+        with open(source, 'r', encoding='utf-8-sig', errors='replace', newline='') as f:
+            yield from self.feed(f)
+
+    def close(self):
+        self.seen.close()
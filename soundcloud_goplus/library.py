@@ -0,0 +1,137 @@
+import os
+import time
+import sqlite3
+import threading
+
+from .constants import SOURCE_URL_TAG
+from .cache import get_cache_dir
+from .urls import normalize_soundcloud_url
+from .verify import VerifyError, hash_audio
+
+def read_source_url(filepath):
+    from mutagen.mp4 import MP4
+
+    try:
+        values = (MP4(filepath).tags or {}).get(SOURCE_URL_TAG)
+    except Exception:
+        return None
+    if not values:
+        return None
+    return bytes(values[0]).decode('utf-8', 'replace')
+
+class LibraryIndex:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_cache_dir(), "library.sqlite3")
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS tracks ("
+                "url TEXT PRIMARY KEY, track_id TEXT, filepath TEXT NOT NULL, "
+                "size INTEGER NOT NULL, mtime REAL NOT NULL, sha256 TEXT NOT NULL, "
+                "added_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS tracks_filepath ON tracks (filepath)")
+
+    def get(self, url):
+        key = normalize_soundcloud_url(url)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT filepath, size, sha256, track_id FROM tracks WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            filepath, size, sha256, track_id = row
+            try:
+                present = os.path.getsize(filepath) == size
+            except OSError:
+                present = False
+            if not present:
+                with self._connection:
+                    self._connection.execute("DELETE FROM tracks WHERE url = ?", (key,))
+                return None
+        return {'url': key, 'track_id': track_id, 'filepath': filepath, 'size': size, 'sha256': sha256}
+
+    def add(self, url, filepath, track_id=None, sha256=None):
+        filepath = os.path.abspath(filepath)
+        stat = os.stat(filepath)
+        sha256 = sha256 or hash_audio(filepath)
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM tracks WHERE filepath = ?", (filepath,))
+            self._connection.execute(
+                "INSERT OR REPLACE INTO tracks "
+                "(url, track_id, filepath, size, mtime, sha256, added_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (normalize_soundcloud_url(url), track_id, filepath, stat.st_size, stat.st_mtime,
+                 sha256, time.time())
+            )
+
+    def remove(self, url):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM tracks WHERE url = ?", (normalize_soundcloud_url(url),))
+
+    def _is_current(self, filepath, stat):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT size, mtime FROM tracks WHERE filepath = ?", (filepath,)
+            ).fetchone()
+        return row is not None and row[0] == stat.st_size and row[1] == stat.st_mtime
+
+    def rebuild(self, directory):
+        added = 0
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if not name.lower().endswith(".m4a"):
+                    continue
+                filepath = os.path.abspath(os.path.join(root, name))
+                try:
+                    stat = os.stat(filepath)
+                except OSError:
+                    continue
+                if self._is_current(filepath, stat):
+                    continue
+                url = read_source_url(filepath)
+                if not url:
+                    continue
+                try:
+                    self.add(url, filepath)
+                except (OSError, VerifyError):
+                    continue
+                added += 1
+        return added
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM tracks").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+_library_index = None
+_library_index_options = {}
+_library_index_lock = threading.Lock()
+
+def get_library_index():
+    global _library_index
+    with _library_index_lock:
+        if _library_index is None:
+            _library_index = LibraryIndex(**_library_index_options)
+        return _library_index
+
+def configure_library_index(**kwargs):
+    global _library_index_options
+    with _library_index_lock:
+        _library_index_options = kwargs
+    close_library_index()
+
+def close_library_index():
+    global _library_index
+    with _library_index_lock:
+        old_index = _library_index
+        _library_index = None
+    if old_index is not None:
+        old_index.close()
@@ -0,0 +1,124 @@
+import re
+import time
+import threading
+from urllib.parse import urlsplit
+
+from .constants import HOST_LIMITS, MIN_THROTTLED_CHUNK_SIZE, LIMIT_WAIT_INTERVAL
+
+RATE_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)\s*([kmg]?)(?:i?b)?(?:/s)?$", re.IGNORECASE)
+RATE_UNITS = {'': 1, 'K': 1024, 'M': 1024 * 1024, 'G': 1024 * 1024 * 1024}
+
+class TokenBucket:
+    def __init__(self, rate=None, burst=None):
+        self._lock = threading.Lock()
+        self.set_rate(rate, burst)
+
+    def set_rate(self, rate, burst=None):
+        with self._lock:
+            self.rate = rate or None
+            self.burst = burst or rate or 0
+            self._tokens = self.burst
+            self._updated = time.monotonic()
+
+    def consume(self, amount, is_cancelled=None):
+        with self._lock:
+            if not self.rate:
+                return
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return
+            deadline = now - self._tokens / self.rate
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.rate or (is_cancelled and is_cancelled()):
+                return
+            time.sleep(min(remaining, LIMIT_WAIT_INTERVAL))
+
+    def chunk_limit(self):
+        rate = self.rate
+        return max(MIN_THROTTLED_CHUNK_SIZE, int(rate / 8)) if rate else None
+
+class _HostSlots:
+    def __init__(self, connections=None, rate=None):
+        self.condition = threading.Condition()
+        self.active = 0
+        self.connections = connections
+        self.bucket = TokenBucket(rate, 1)
+
+    def configure(self, connections=None, rate=None):
+        with self.condition:
+            self.connections = connections
+            self.condition.notify_all()
+        self.bucket.set_rate(rate, 1)
+
+    def acquire(self):
+        with self.condition:
+            while self.connections and self.active >= self.connections:
+                self.condition.wait()
+            self.active += 1
+        self.bucket.consume(1)
+
+    def release(self):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify()
+
+class HostLimiter:
+    def __init__(self, connections=None, rate=None, hosts=None):
+        self._lock = threading.Lock()
+        self._slots = {}
+        self.configure(connections, rate, hosts)
+
+    def configure(self, connections=None, rate=None, hosts=None):
+        with self._lock:
+            self.connections = connections or None
+            self.rate = rate or None
+            self.hosts = dict(HOST_LIMITS if hosts is None else hosts)
+            for host, slots in self._slots.items():
+                slots.configure(*self._limits_for(host))
+
+    def _limits_for(self, host):
+        limits = self.hosts.get(host, {})
+        return limits.get('connections', self.connections), limits.get('rate', self.rate)
+
+    def _get_slots(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            slots = self._slots.get(host)
+            if slots is None:
+                connections, rate = self._limits_for(host)
+                if not connections and not rate:
+                    return None
+                slots = self._slots[host] = _HostSlots(connections, rate)
+            return slots
+
+    def acquire(self, url):
+        slots = self._get_slots(url)
+        if slots is None:
+            return None
+        slots.acquire()
+        return slots.release
+
+_bandwidth_limiter = TokenBucket()
+_host_limiter = HostLimiter()
+
+def get_bandwidth_limiter():
+    return _bandwidth_limiter
+
+def get_host_limiter():
+    return _host_limiter
+
+def configure_limits(bandwidth=None, host_connections=None, host_rate=None, hosts=None):
+    _bandwidth_limiter.set_rate(bandwidth)
+    _host_limiter.configure(host_connections, host_rate, hosts)
+
+def parse_rate(value):
+    match = RATE_PATTERN.match(str(value).strip())
+    if not match:
+        raise ValueError(f"invalid rate: {value}")
+    number, unit = match.groups()
+    return int(float(number) * RATE_UNITS[unit.upper()])
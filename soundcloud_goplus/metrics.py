@@ -0,0 +1,323 @@
+import os
+import json
+import time
+import uuid
+import threading
+from contextlib import contextmanager
+
+from .constants import METRICS_BUCKETS, METRICS_PREFIX
+from .sessions import get_cookie_pools
+from .cache import get_track_info_cache_stats
+
+def classify_error(error):
+    if error is None:
+        return None
+    if type(error) is Exception and error.__cause__ is not None:
+        return classify_error(error.__cause__)
+
+    from .downloader import DownloadCancelled, IncompleteDownloadError
+    from .resolver import ResolveError
+    from .tagging import TagError
+    from .verify import VerifyError
+
+    if isinstance(error, DownloadCancelled):
+        return "cancelled"
+    if isinstance(error, IncompleteDownloadError):
+        return "incomplete"
+    if isinstance(error, ResolveError):
+        return "resolve"
+    if isinstance(error, VerifyError):
+        return "corrupt"
+    if isinstance(error, TagError):
+        return "tag"
+
+    response = getattr(error, 'response', None)
+    if response is not None and getattr(response, 'status_code', None):
+        return f"http_{response.status_code // 100}xx"
+
+    name = type(error).__name__
+    if "Timeout" in name:
+        return "timeout"
+    if "Connection" in name or isinstance(error, ConnectionError):
+        return "connection"
+    if type(error).__module__.split('.')[0] in ("requests", "urllib3"):
+        return "network"
+    if isinstance(error, OSError):
+        return "io"
+    return name.lower()
+
+class JobMetrics:
+    def __init__(self, url=None, job_id=None):
+        self.job_id = job_id or uuid.uuid4().hex[:12]
+        self.url = url
+        self.started_at = time.time()
+        self.phases = {}
+        self.bytes = 0
+        self.size = 0
+        self.time_to_first_byte = None
+        self.retries = 0
+        self.retry_errors = {}
+        self.outcome = None
+        self.error_class = None
+        self.error = None
+        self._started = time.perf_counter()
+
+    def add_phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_phase(name, time.perf_counter() - started)
+
+    def add_retry(self, error):
+        self.retries += 1
+        error_class = classify_error(error)
+        self.retry_errors[error_class] = self.retry_errors.get(error_class, 0) + 1
+
+    def finish(self, error=None):
+        self.error_class = classify_error(error)
+        self.error = str(error) if error is not None else None
+        if error is None:
+            self.outcome = "completed"
+        elif self.error_class == "cancelled":
+            self.outcome = "cancelled"
+        else:
+            self.outcome = "failed"
+        self.phases['total'] = time.perf_counter() - self._started
+
+    @property
+    def throughput(self):
+        duration = self.phases.get('download')
+        return self.bytes / duration if duration else 0.0
+
+    def to_dict(self):
+        return {
+            'job_id': self.job_id,
+            'url': self.url,
+            'started_at': round(self.started_at, 3),
+            'outcome': self.outcome,
+            'phases': {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            'time_to_first_byte': (round(self.time_to_first_byte, 6)
+                                   if self.time_to_first_byte is not None else None),
+            'bytes': self.bytes,
+            'size': self.size,
+            'throughput': round(self.throughput, 1),
+            'retries': self.retries,
+            'retry_errors': self.retry_errors,
+            'error_class': self.error_class,
+            'error': self.error
+        }
+
+class _Histogram:
+    def __init__(self, buckets=METRICS_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.total += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+class MetricsRecorder:
+    def __init__(self, jsonl_path=None, prometheus_path=None):
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._errors = {}
+        self._retries = {}
+        self._phases = {}
+        self._first_byte = _Histogram()
+        self._bytes = 0
+        self._server = None
+
+        for path in (jsonl_path, prometheus_path):
+            if path and os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def record(self, job):
+        with self._lock:
+            self._jobs[job.outcome] = self._jobs.get(job.outcome, 0) + 1
+            if job.error_class and job.outcome == "failed":
+                self._errors[job.error_class] = self._errors.get(job.error_class, 0) + 1
+            for error_class, count in job.retry_errors.items():
+                self._retries[error_class] = self._retries.get(error_class, 0) + count
+            for name, seconds in job.phases.items():
+                self._phases.setdefault(name, _Histogram()).observe(seconds)
+            if job.time_to_first_byte is not None:
+                self._first_byte.observe(job.time_to_first_byte)
+            self._bytes += job.bytes
+
+            if self.jsonl_path:
+                with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(job.to_dict()) + "\n")
+            if self.prometheus_path:
+                self._write_prometheus()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'jobs': dict(self._jobs),
+                'errors': dict(self._errors),
+                'retries': dict(self._retries),
+                'bytes': self._bytes,
+                'phases': {name: {'count': histogram.count, 'seconds': histogram.total}
+                           for name, histogram in self._phases.items()}
+            }
+
+    def _format_histogram(self, lines, name, histogram, labels=""):
+        separator = "," if labels else ""
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            lines.append(f'{name}_bucket{{{labels}{separator}le="{bound}"}} {count}')
+        lines.append(f'{name}_bucket{{{labels}{separator}le="+Inf"}} {histogram.count}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {histogram.total:.6f}")
+        lines.append(f"{name}_count{suffix} {histogram.count}")
+
+    def render_prometheus(self):
+        with self._lock:
+            return self._render_prometheus()
+
+    def _render_prometheus(self):
+        lines = [
+            f"# HELP {METRICS_PREFIX}_jobs_total Finished download jobs by outcome.",
+            f"# TYPE {METRICS_PREFIX}_jobs_total counter",
+        ]
+        for outcome, count in sorted(self._jobs.items()):
+            lines.append(f'{METRICS_PREFIX}_jobs_total{{outcome="{outcome}"}} {count}')
+
+        lines += [
+            f"# HELP {METRICS_PREFIX}_errors_total Failed jobs by error class.",
+            f"# TYPE {METRICS_PREFIX}_errors_total counter",
+        ]
+        for error_class, count in sorted(self._errors.items()):
+            lines.append(f'{METRICS_PREFIX}_errors_total{{class="{error_class}"}} {count}')
+
+        lines += [
+            f"# HELP {METRICS_PREFIX}_retries_total Download retries by error class.",
+            f"# TYPE {METRICS_PREFIX}_retries_total counter",
+        ]
+        for error_class, count in sorted(self._retries.items()):
+            lines.append(f'{METRICS_PREFIX}_retries_total{{class="{error_class}"}} {count}')
+
+        lines += [
+            f"# HELP {METRICS_PREFIX}_downloaded_bytes_total Bytes received from the CDN.",
+            f"# TYPE {METRICS_PREFIX}_downloaded_bytes_total counter",
+            f"{METRICS_PREFIX}_downloaded_bytes_total {self._bytes}",
+            f"# HELP {METRICS_PREFIX}_phase_seconds Time spent per job phase.",
+            f"# TYPE {METRICS_PREFIX}_phase_seconds histogram",
+        ]
+        for name, histogram in sorted(self._phases.items()):
+            self._format_histogram(lines, f"{METRICS_PREFIX}_phase_seconds", histogram, f'phase="{name}"')
+
+        lines += [
+            f"# HELP {METRICS_PREFIX}_time_to_first_byte_seconds Time from download start to the first audio byte.",
+            f"# TYPE {METRICS_PREFIX}_time_to_first_byte_seconds histogram",
+        ]
+        self._format_histogram(lines, f"{METRICS_PREFIX}_time_to_first_byte_seconds", self._first_byte)
+
+        sessions = [session for pool in get_cookie_pools() for session in pool.stats()]
+        lines += [
+            f"# HELP {METRICS_PREFIX}_session_requests_total Track info requests per cookie session.",
+            f"# TYPE {METRICS_PREFIX}_session_requests_total counter",
+        ]
+        for session in sessions:
+            for outcome in ('successes', 'failures', 'rate_limited'):
+                lines.append(f'{METRICS_PREFIX}_session_requests_total'
+                             f'{{session="{session["label"]}",outcome="{outcome}"}} {session[outcome]}')
+        lines += [
+            f"# HELP {METRICS_PREFIX}_session_cooldown_seconds Remaining cooldown per cookie session.",
+            f"# TYPE {METRICS_PREFIX}_session_cooldown_seconds gauge",
+        ]
+        for session in sessions:
+            lines.append(f'{METRICS_PREFIX}_session_cooldown_seconds{{session="{session["label"]}"}} '
+                         f'{session["cooldown"]:.1f}')
+
+        cache = get_track_info_cache_stats()
+        if cache is not None:
+            lines += [
+                f"# HELP {METRICS_PREFIX}_track_info_cache_lookups_total Track info cache lookups by result.",
+                f"# TYPE {METRICS_PREFIX}_track_info_cache_lookups_total counter",
+                f'{METRICS_PREFIX}_track_info_cache_lookups_total{{result="hit"}} {cache["hits"]}',
+                f'{METRICS_PREFIX}_track_info_cache_lookups_total{{result="miss"}} {cache["misses"]}',
+                f"# HELP {METRICS_PREFIX}_track_info_cache_expired_total Lookups that found an expired entry.",
+                f"# TYPE {METRICS_PREFIX}_track_info_cache_expired_total counter",
+                f"{METRICS_PREFIX}_track_info_cache_expired_total {cache['expired']}",
+                f"# HELP {METRICS_PREFIX}_track_info_cache_entries Entries in the track info cache.",
+                f"# TYPE {METRICS_PREFIX}_track_info_cache_entries gauge",
+                f"{METRICS_PREFIX}_track_info_cache_entries {cache['entries']}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def _write_prometheus(self):
+        temp_path = self.prometheus_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self._render_prometheus())
+        os.replace(temp_path, self.prometheus_path)
+
+    def serve(self, port, host="127.0.0.1"):
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+        recorder = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = recorder.render_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address[1]
+
+    def close(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+_metrics = None
+_metrics_options = {}
+_metrics_lock = threading.Lock()
+
+def get_metrics():
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = MetricsRecorder(**_metrics_options)
+        return _metrics
+
+def configure_metrics(**kwargs):
+    global _metrics, _metrics_options
+    with _metrics_lock:
+        old_metrics = _metrics
+        _metrics = None
+        _metrics_options = kwargs
+    if old_metrics is not None:
+        old_metrics.close()
+
+def close_metrics():
+    global _metrics
+    with _metrics_lock:
+        old_metrics = _metrics
+        _metrics = None
+    if old_metrics is not None:
+        old_metrics.close()
@@ -0,0 +1,122 @@
+import threading
+from http.cookiejar import DefaultCookiePolicy
+
+from .constants import (REQUEST_TIMEOUT, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE,
+                        HTTP_HOST_POOL_SIZES, HTTP_RETRIES, HTTP_BACKOFF_FACTOR,
+                        HTTP_RETRY_STATUSES)
+from .limits import get_host_limiter
+
+class HttpClient:
+    def __init__(self, retries=HTTP_RETRIES, backoff_factor=HTTP_BACKOFF_FACTOR,
+                 pool_maxsize=HTTP_POOL_MAXSIZE, host_pool_sizes=None):
+        import requests
+
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.session = requests.Session()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+        default_adapter = self._create_adapter(pool_maxsize)
+        self.session.mount("http://", default_adapter)
+        self.session.mount("https://", default_adapter)
+
+        if host_pool_sizes is None:
+            host_pool_sizes = HTTP_HOST_POOL_SIZES
+        for prefix, size in host_pool_sizes.items():
+            self.session.mount(prefix, self._create_adapter(size))
+
+    def _create_adapter(self, pool_maxsize):
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=HTTP_RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD", "POST"}),
+            raise_on_status=False
+        )
+        return HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry
+        )
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+        release = get_host_limiter().acquire(url)
+        if release is None:
+            return self.session.request(method, url, **kwargs)
+
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except BaseException:
+            release()
+            raise
+        if not kwargs.get('stream'):
+            release()
+            return response
+        return self._release_on_close(response, release)
+
+    def _release_on_close(self, response, release):
+        close = response.close
+        pending = threading.Lock()
+
+        def close_and_release():
+            try:
+                close()
+            finally:
+                if pending.acquire(blocking=False):
+                    release()
+
+        response.close = close_and_release
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def prewarm(self, url):
+        try:
+            self.head(url, allow_redirects=False).close()
+        except Exception:
+            pass
+
+    def close(self):
+        self.session.close()
+
+_http_client = None
+_http_client_options = {}
+_http_client_lock = threading.Lock()
+
+def get_http_client():
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = HttpClient(**_http_client_options)
+        return _http_client
+
+def configure_http_client(**kwargs):
+    global _http_client, _http_client_options
+    with _http_client_lock:
+        old_client = _http_client
+        _http_client = None
+        _http_client_options = kwargs
+    if old_client is not None:
+        old_client.close()
+
+def close_http_client():
+    global _http_client
+    with _http_client_lock:
+        old_client = _http_client
+        _http_client = None
+    if old_client is not None:
+        old_client.close()
@@ -0,0 +1,128 @@
+import re
+import threading
+
+from .constants import (SOUNDCLOUD_URL, SOUNDCLOUD_API_URL, PLAYLIST_BATCH_SIZE,
+                        USER_TRACKS_PAGE_SIZE, API_HEADERS)
+from .network import get_http_client
+from .urls import get_collection_kind, normalize_soundcloud_url
+
+CLIENT_ID_PATTERN = re.compile(r'client_id\s*[:=]\s*"([0-9a-zA-Z]{32})"')
+SCRIPT_PATTERN = re.compile(r'<script[^>]+src="(https://[^"]+\.js)"')
+
+class PlaylistError(Exception):
+    pass
+
+class SoundCloudApi:
+    def __init__(self):
+        self._client_id = None
+        self._lock = threading.Lock()
+
+    def _discover_client_id(self):
+        headers = {"User-Agent": API_HEADERS["User-Agent"]}
+        response = get_http_client().get(SOUNDCLOUD_URL, headers=headers)
+        response.raise_for_status()
+
+        for script_url in reversed(SCRIPT_PATTERN.findall(response.text)):
+            script = get_http_client().get(script_url, headers=headers)
+            if script.status_code != 200:
+                continue
+            match = CLIENT_ID_PATTERN.search(script.text)
+            if match:
+                return match.group(1)
+        raise PlaylistError("Could not find a SoundCloud client id")
+
+    def get_client_id(self, refresh=False):
+        with self._lock:
+            if self._client_id is None or refresh:
+                self._client_id = self._discover_client_id()
+            return self._client_id
+
+    def request(self, url, params=None):
+        import requests
+
+        params = dict(params or {})
+        for attempt in range(2):
+            params['client_id'] = self.get_client_id(refresh=attempt > 0)
+            try:
+                response = get_http_client().get(url, params=params)
+                if response.status_code in (401, 403) and attempt == 0:
+                    continue
+                response.raise_for_status()
+                return response.json()
+            except requests.exceptions.RequestException as e:
+                raise PlaylistError(f"SoundCloud API error: {str(e)}") from e
+            except ValueError as e:
+                raise PlaylistError(f"Invalid SoundCloud API response: {str(e)}") from e
+
+    def resolve(self, url):
+        return self.request(f"{SOUNDCLOUD_API_URL}/resolve", {'url': url})
+
+    def _fetch_tracks(self, track_ids):
+        tracks = self.request(f"{SOUNDCLOUD_API_URL}/tracks", {'ids': ",".join(map(str, track_ids))})
+        by_id = {track.get('id'): track for track in tracks}
+        return [by_id[track_id] for track_id in track_ids if track_id in by_id]
+
+    def iter_playlist_tracks(self, playlist):
+        stubs = []
+        for track in playlist.get('tracks', []):
+            if track.get('permalink_url'):
+                if stubs:
+                    yield from self._fetch_tracks(stubs)
+                    stubs = []
+                yield track
+            elif track.get('id') is not None:
+                stubs.append(track['id'])
+                if len(stubs) >= PLAYLIST_BATCH_SIZE:
+                    yield from self._fetch_tracks(stubs)
+                    stubs = []
+        if stubs:
+            yield from self._fetch_tracks(stubs)
+
+    def iter_user_tracks(self, user):
+        url = f"{SOUNDCLOUD_API_URL}/users/{user['id']}/tracks"
+        params = {'limit': USER_TRACKS_PAGE_SIZE, 'linked_partitioning': 1}
+        while url:
+            page = self.request(url, params)
+            yield from page.get('collection', [])
+            url = page.get('next_href')
+            params = None
+
+    def iter_tracks(self, url):
+        if get_collection_kind(url) == "user":
+            url = normalize_soundcloud_url(url)
+            if url.endswith("/tracks"):
+                url = url[:-len("/tracks")]
+
+        resource = self.resolve(url)
+        resource_kind = resource.get('kind')
+        if resource_kind == "track":
+            yield resource
+        elif resource_kind in ("playlist", "system-playlist"):
+            yield from self.iter_playlist_tracks(resource)
+        elif resource_kind == "user":
+            yield from self.iter_user_tracks(resource)
+        else:
+            raise PlaylistError(f"Unsupported SoundCloud URL: {url}")
+
+_soundcloud_api = None
+_soundcloud_api_lock = threading.Lock()
+
+def get_soundcloud_api():
+    global _soundcloud_api
+    with _soundcloud_api_lock:
+        if _soundcloud_api is None:
+            _soundcloud_api = SoundCloudApi()
+        return _soundcloud_api
+
+def get_track_title(track):
+    user = track.get('user') or {}
+    return user.get('username', 'Unknown'), track.get('title', 'Unknown')
+
+def expand_url(url):
+    if get_collection_kind(url) is None:
+        yield url
+        return
+
+    for track in get_soundcloud_api().iter_tracks(url):
+        if track.get('permalink_url'):
+            yield track['permalink_url']
@@ -0,0 +1,155 @@
+import io
+import signal
+import importlib
+import importlib.util
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .constants import POSTPROCESS_COVER_QUALITY, POSTPROCESS_WAIT_INTERVAL
+from .tagging import make_tags, apply_tags
+
+def cover_resizing_available():
+    return importlib.util.find_spec("PIL") is not None
+
+def resize_cover(job):
+    max_size = job['options'].get('max_cover_size')
+    cover = job['cover']
+    if not max_size or not cover:
+        return
+    try:
+        from PIL import Image
+    except ImportError:
+        return
+
+    try:
+        with Image.open(io.BytesIO(cover)) as image:
+            if max(image.size) <= max_size:
+                return
+            image.thumbnail((max_size, max_size), Image.LANCZOS)
+            if image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            output = io.BytesIO()
+            image.save(output, "JPEG", optimize=True,
+                       quality=job['options'].get('cover_quality', POSTPROCESS_COVER_QUALITY))
+    except Exception:
+        return
+    job['cover'] = output.getvalue()
+
+def tag_track(job):
+    options = job['options']
+    tags = make_tags(job['track_info'], job['url'], job['cover'],
+                     options.get('extra_tags', False), options.get('comment'))
+    tags.update(job['tags'])
+    apply_tags(job['path'], tags)
+
+DEFAULT_STEPS = (resize_cover, tag_track)
+
+def _init_worker():
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    importlib.import_module("mutagen.mp4")
+
+def run_steps(path, track_info, url, cover, options, steps):
+    job = {'path': path, 'track_info': track_info, 'url': url, 'cover': cover,
+           'options': options, 'tags': {}}
+    for step in steps:
+        step(job)
+
+class PostProcessor:
+    def __init__(self, workers=0, max_pending=None, steps=DEFAULT_STEPS,
+                 max_cover_size=0, cover_quality=POSTPROCESS_COVER_QUALITY, extra_tags=False,
+                 comment=None):
+        self.workers = max(0, workers)
+        self.max_pending = max_pending or max(1, self.workers) * 2
+        self.steps = tuple(steps)
+        self.options = {
+            'max_cover_size': max_cover_size,
+            'cover_quality': cover_quality,
+            'extra_tags': extra_tags,
+            'comment': comment
+        }
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context("spawn"),
+                                                     initializer=_init_worker)
+                for _ in range(self.workers):
+                    self._executor.submit(int)
+            return self._executor
+
+    def start(self):
+        if self.workers:
+            self._get_executor()
+
+    def _reset_executor(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def _acquire_slot(self, is_cancelled=None, on_status=None):
+        if self._slots.acquire(blocking=False):
+            return
+        if on_status:
+            on_status("Waiting for post-processing...")
+        while not self._slots.acquire(timeout=POSTPROCESS_WAIT_INTERVAL):
+            if is_cancelled and is_cancelled():
+                from .downloader import DownloadCancelled
+                raise DownloadCancelled("Download cancelled")
+
+    def process(self, path, track_info, url=None, cover=None, is_cancelled=None, on_status=None):
+        self._acquire_slot(is_cancelled, on_status)
+        try:
+            if self.workers == 0:
+                return run_steps(path, track_info, url, cover, self.options, self.steps)
+
+            executor = self._get_executor()
+            try:
+                future = executor.submit(run_steps, path, dict(track_info), url, cover,
+                                         self.options, self.steps)
+                return future.result()
+            except BrokenProcessPool as e:
+                self._reset_executor(executor)
+                raise Exception(f"Post-processing worker crashed: {str(e)}") from e
+        finally:
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+_postprocessor = None
+_postprocessor_options = {}
+_postprocessor_lock = threading.Lock()
+
+def get_postprocessor():
+    global _postprocessor
+    with _postprocessor_lock:
+        if _postprocessor is None:
+            _postprocessor = PostProcessor(**_postprocessor_options)
+        return _postprocessor
+
+def configure_postprocessor(**kwargs):
+    global _postprocessor_options
+    if kwargs.get('max_cover_size') and not cover_resizing_available():
+        raise ValueError("Resizing cover art requires Pillow (pip install Pillow)")
+    with _postprocessor_lock:
+        _postprocessor_options = kwargs
+    close_postprocessor()
+
+def close_postprocessor():
+    global _postprocessor
+    with _postprocessor_lock:
+        old_postprocessor = _postprocessor
+        _postprocessor = None
+    if old_postprocessor is not None:
+        old_postprocessor.close()
@@ -0,0 +1,315 @@
+import math
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .constants import (DEFAULT_COOKIES, SCINFO_URL, API_HEADERS, REQUEST_TIMEOUT, COOKIE_ATTEMPTS,
+                        COOKIE_FAILURE_STATUSES, RESOLVER_ENDPOINTS, RESOLVE_HEDGE_PERCENTILE,
+                        RESOLVE_HEDGE_DEFAULT_DELAY, RESOLVE_HEDGE_MIN_DELAY, RESOLVE_HEDGE_MIN_SAMPLES,
+                        RESOLVE_HEDGE_WORKERS, RESOLVE_LATENCY_SAMPLES, RESOLVE_ENDPOINT_COOLDOWN,
+                        RESOLVE_ENDPOINT_MAX_COOLDOWN)
+from .cache import get_track_info_cache
+from .network import get_http_client
+from .sessions import get_cookie_pool
+
+class ResolveError(Exception):
+    pass
+
+class _CookieRejected(Exception):
+    def __init__(self, error, status, retry_after=None):
+        super().__init__(str(error))
+        self.error = error
+        self.status = status
+        self.retry_after = retry_after
+
+def _retry_after(response):
+    value = response.headers.get('retry-after', '')
+    return float(value) if value.strip().isdigit() else None
+
+def _post_scinfo(url, cookie, endpoint):
+    import requests
+
+    headers = dict(API_HEADERS)
+    headers["Cookie"] = cookie
+
+    try:
+        response = get_http_client().post(
+            endpoint,
+            data={"url": url},
+            headers=headers,
+            timeout=REQUEST_TIMEOUT
+        )
+        if response.status_code in COOKIE_FAILURE_STATUSES:
+            error = requests.exceptions.HTTPError(
+                f"{response.status_code} Client Error for url: {response.url}", response=response)
+            raise _CookieRejected(error, response.status_code, _retry_after(response))
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.RequestException as e:
+        raise ResolveError(f"Network error: {str(e)}") from e
+    except ValueError as e:
+        raise ResolveError(f"Invalid response from track info service: {str(e)}") from e
+
+class ScinfoBackend:
+    def __init__(self, endpoint=SCINFO_URL):
+        self.endpoint = endpoint
+        self.name = endpoint
+
+    def resolve(self, url, cookie):
+        return _post_scinfo(url, cookie, self.endpoint)
+
+class ResolverEndpoint:
+    def __init__(self, backend, samples=RESOLVE_LATENCY_SAMPLES):
+        self.backend = ScinfoBackend(backend) if isinstance(backend, str) else backend
+        self.name = self.backend.name
+        self.latencies = deque(maxlen=samples)
+        self.successes = 0
+        self.failures = 0
+        self.hedges = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.in_flight = 0
+
+    @property
+    def requests(self):
+        return self.successes + self.failures
+
+    @property
+    def error_rate(self):
+        return self.failures / self.requests if self.requests else 0.0
+
+    def percentile(self, fraction):
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[max(0, math.ceil(fraction * len(latencies)) - 1)]
+
+    def is_available(self, now):
+        return self.cooldown_until <= now
+
+    def expected_latency(self):
+        latency = self.percentile(0.5)
+        return RESOLVE_HEDGE_DEFAULT_DELAY if latency is None else latency
+
+    def to_dict(self, now=None):
+        now = now or time.time()
+        return {
+            'name': self.name,
+            'successes': self.successes,
+            'failures': self.failures,
+            'hedges': self.hedges,
+            'error_rate': self.error_rate,
+            'p50': self.percentile(0.5),
+            'p99': self.percentile(0.99),
+            'in_flight': self.in_flight,
+            'cooldown': max(0.0, self.cooldown_until - now)
+        }
+
+class ResolverPool:
+    def __init__(self, endpoints=RESOLVER_ENDPOINTS, hedge=True, hedge_percentile=RESOLVE_HEDGE_PERCENTILE,
+                 cooldown=RESOLVE_ENDPOINT_COOLDOWN, max_cooldown=RESOLVE_ENDPOINT_MAX_COOLDOWN,
+                 workers=RESOLVE_HEDGE_WORKERS):
+        self.endpoints = [ResolverEndpoint(endpoint) for endpoint in endpoints]
+        if not self.endpoints:
+            raise ValueError("At least one resolver endpoint is required")
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.workers = workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.endpoints)
+
+    def acquire(self, exclude=()):
+        with self._lock:
+            now = time.time()
+            candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude] or self.endpoints
+            available = [endpoint for endpoint in candidates if endpoint.is_available(now)]
+            if available:
+                endpoint = min(available, key=lambda e: (e.consecutive_failures, e.expected_latency(),
+                                                          e.in_flight))
+            else:
+                endpoint = min(candidates, key=lambda e: e.cooldown_until)
+            endpoint.in_flight += 1
+            return endpoint
+
+    def report(self, endpoint, ok, latency=None, retry_after=None):
+        with self._lock:
+            endpoint.in_flight = max(0, endpoint.in_flight - 1)
+            if ok:
+                endpoint.successes += 1
+                endpoint.consecutive_failures = 0
+                endpoint.cooldown_until = 0.0
+                if latency is not None:
+                    endpoint.latencies.append(latency)
+                return
+
+            endpoint.failures += 1
+            endpoint.consecutive_failures += 1
+            delay = min(self.max_cooldown, self.cooldown * (2 ** (endpoint.consecutive_failures - 1)))
+            if retry_after:
+                delay = max(delay, min(self.max_cooldown, retry_after))
+            endpoint.cooldown_until = time.time() + delay
+
+    def release(self, endpoint):
+        with self._lock:
+            endpoint.in_flight = max(0, endpoint.in_flight - 1)
+
+    def _blames_endpoint(self, rejection):
+        return rejection.status == 429 or (rejection.status == 403 and len(self.endpoints) > 1)
+
+    def hedge_delay(self, endpoint):
+        with self._lock:
+            if len(endpoint.latencies) < RESOLVE_HEDGE_MIN_SAMPLES:
+                return RESOLVE_HEDGE_DEFAULT_DELAY
+            return max(RESOLVE_HEDGE_MIN_DELAY, endpoint.percentile(self.hedge_percentile))
+
+    def _call(self, endpoint, url, cookie):
+        start = time.monotonic()
+        try:
+            result = endpoint.backend.resolve(url, cookie)
+            if not isinstance(result, dict):
+                raise ResolveError("Unexpected response from track info service")
+        except _CookieRejected as e:
+            if self._blames_endpoint(e):
+                self.report(endpoint, False, retry_after=e.retry_after)
+            else:
+                self.release(endpoint)
+            raise
+        except BaseException:
+            self.report(endpoint, False)
+            raise
+        self.report(endpoint, True, time.monotonic() - start)
+        return result
+
+    def _submit(self, endpoint, url, cookie):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix="resolver")
+            return self._executor.submit(self._call, endpoint, url, cookie)
+
+    def resolve(self, url, cookie):
+        attempts = len(self.endpoints) + (1 if self.hedge else 0)
+        tried = []
+        pending = {}
+        hedged = not self.hedge
+        error = None
+        rejected = None
+        while True:
+            if not pending:
+                if len(tried) >= attempts or (rejected and len(tried) >= len(self.endpoints)):
+                    raise rejected or error
+                endpoint = self.acquire(exclude=tried)
+                tried.append(endpoint)
+                pending[self._submit(endpoint, url, cookie)] = endpoint
+
+            timeout = None if hedged else self.hedge_delay(endpoint)
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                endpoint = self.acquire(exclude=tried)
+                tried.append(endpoint)
+                with self._lock:
+                    endpoint.hedges += 1
+                pending[self._submit(endpoint, url, cookie)] = endpoint
+                continue
+
+            for future in done:
+                del pending[future]
+                try:
+                    return future.result()
+                except _CookieRejected as e:
+                    rejected = e
+                except Exception as e:
+                    error = e
+
+    def stats(self):
+        with self._lock:
+            now = time.time()
+            return [endpoint.to_dict(now) for endpoint in self.endpoints]
+
+    def close(self):
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+_resolver_pool = None
+_resolver_options = {}
+_resolver_pools = {}
+_resolver_lock = threading.Lock()
+
+def get_resolver_pool(endpoints=None):
+    global _resolver_pool
+    if isinstance(endpoints, ResolverPool):
+        return endpoints
+    with _resolver_lock:
+        if endpoints is None:
+            if _resolver_pool is None:
+                _resolver_pool = ResolverPool(**_resolver_options)
+            return _resolver_pool
+
+        key = (endpoints,) if isinstance(endpoints, str) else tuple(endpoints)
+        pool = _resolver_pools.get(key)
+        if pool is None:
+            options = dict(_resolver_options)
+            options['endpoints'] = key
+            pool = _resolver_pools[key] = ResolverPool(**options)
+        return pool
+
+def configure_resolver(**kwargs):
+    global _resolver_options
+    with _resolver_lock:
+        _resolver_options = {key: value for key, value in kwargs.items() if value is not None}
+    close_resolver()
+
+def close_resolver():
+    global _resolver_pool, _resolver_pools
+    with _resolver_lock:
+        pools = list(_resolver_pools.values())
+        if _resolver_pool is not None:
+            pools.append(_resolver_pool)
+        _resolver_pool = None
+        _resolver_pools = {}
+    for pool in pools:
+        pool.close()
+
+def refresh_track_info(url, cookies=DEFAULT_COOKIES, endpoint=None):
+    get_track_info_cache().invalidate(url)
+    return resolve_track(url, cookies, endpoint=endpoint)
+
+def resolve_track(url, cookies=DEFAULT_COOKIES, use_cache=True, endpoint=None):
+    cache = get_track_info_cache()
+    if use_cache:
+        cached = cache.get(url)
+        if cached is not None:
+            return cached
+
+    pool = get_cookie_pool(cookies)
+    resolvers = get_resolver_pool(endpoint)
+    tried = []
+    while True:
+        session = pool.acquire(exclude=tried)
+        tried.append(session)
+        try:
+            result = resolvers.resolve(url, session.cookie)
+        except _CookieRejected as e:
+            pool.report(session, False, e.status, e.retry_after)
+            if len(tried) >= min(len(pool), COOKIE_ATTEMPTS):
+                raise ResolveError(f"Network error: {str(e.error)}") from e.error
+            continue
+        except BaseException:
+            pool.release(session)
+            raise
+        pool.report(session, True)
+        break
+
+    if use_cache:
+        cache.put(url, result)
+    return result
@@ -0,0 +1,124 @@
+import time
+import hashlib
+import threading
+
+from .constants import (DEFAULT_COOKIES, COOKIE_SEPARATOR, COOKIE_COOLDOWN, COOKIE_MAX_COOLDOWN,
+                        COOKIE_FAILURE_STATUSES)
+
+def parse_cookies(value):
+    if isinstance(value, (list, tuple)):
+        parts = value
+    else:
+        parts = (value or "").replace("\n", COOKIE_SEPARATOR).split(COOKIE_SEPARATOR)
+
+    cookies = []
+    for part in parts:
+        part = part.strip()
+        if part and part not in cookies:
+            cookies.append(part)
+    return cookies or [DEFAULT_COOKIES]
+
+class CookieSession:
+    def __init__(self, cookie):
+        self.cookie = cookie
+        self.label = hashlib.sha1(cookie.encode('utf-8')).hexdigest()[:8]
+        self.successes = 0
+        self.failures = 0
+        self.rate_limited = 0
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.in_flight = 0
+
+    @property
+    def requests(self):
+        return self.successes + self.failures
+
+    @property
+    def success_rate(self):
+        return self.successes / self.requests if self.requests else 1.0
+
+    def is_available(self, now):
+        return self.cooldown_until <= now
+
+    def to_dict(self, now=None):
+        now = now or time.time()
+        return {
+            'label': self.label,
+            'successes': self.successes,
+            'failures': self.failures,
+            'rate_limited': self.rate_limited,
+            'success_rate': self.success_rate,
+            'in_flight': self.in_flight,
+            'cooldown': max(0.0, self.cooldown_until - now)
+        }
+
+class CookiePool:
+    def __init__(self, cookies, cooldown=COOKIE_COOLDOWN, max_cooldown=COOKIE_MAX_COOLDOWN):
+        self.sessions = [CookieSession(cookie) for cookie in parse_cookies(cookies)]
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def acquire(self, exclude=()):
+        with self._lock:
+            now = time.time()
+            count = len(self.sessions)
+            rotated = [self.sessions[(self._next + index) % count] for index in range(count)]
+            candidates = [session for session in rotated if session not in exclude] or rotated
+            available = [session for session in candidates if session.is_available(now)]
+            if available:
+                session = min(available, key=lambda s: s.in_flight)
+                self._next = (self.sessions.index(session) + 1) % count
+            else:
+                session = min(candidates, key=lambda s: s.cooldown_until)
+            session.in_flight += 1
+            return session
+
+    def report(self, session, ok, status=None, retry_after=None):
+        with self._lock:
+            session.in_flight = max(0, session.in_flight - 1)
+            if ok:
+                session.successes += 1
+                session.consecutive_failures = 0
+                return
+
+            session.failures += 1
+            if status not in COOKIE_FAILURE_STATUSES:
+                return
+            if status == 429:
+                session.rate_limited += 1
+            session.consecutive_failures += 1
+            delay = min(self.max_cooldown, self.cooldown * (2 ** (session.consecutive_failures - 1)))
+            if retry_after:
+                delay = max(delay, min(self.max_cooldown, retry_after))
+            session.cooldown_until = time.time() + delay
+
+    def release(self, session):
+        with self._lock:
+            session.in_flight = max(0, session.in_flight - 1)
+
+    def stats(self):
+        with self._lock:
+            now = time.time()
+            return [session.to_dict(now) for session in self.sessions]
+
+_cookie_pools = {}
+_cookie_pools_lock = threading.Lock()
+
+def get_cookie_pool(cookies=DEFAULT_COOKIES):
+    if isinstance(cookies, CookiePool):
+        return cookies
+    key = tuple(parse_cookies(cookies))
+    with _cookie_pools_lock:
+        pool = _cookie_pools.get(key)
+        if pool is None:
+            pool = _cookie_pools[key] = CookiePool(key)
+        return pool
+
+def get_cookie_pools():
+    with _cookie_pools_lock:
+        return list(_cookie_pools.values())
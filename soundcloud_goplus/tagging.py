@@ -0,0 +1,54 @@
+from .cache import get_artwork_cache
+from .constants import SOURCE_URL_TAG
+from .urls import normalize_soundcloud_url
+
+class TagError(Exception):
+    pass
+
+def fetch_cover(track_info):
+    return get_artwork_cache().get(track_info.get('thumb'))
+
+def make_tags(track_info, url=None, cover=None, extra_tags=False, comment=None):
+    from mutagen.mp4 import MP4Cover, MP4FreeForm
+
+    tags = {}
+    if track_info.get('artist'):
+        tags['\xa9ART'] = [track_info['artist']]
+    if track_info.get('date'):
+        tags['\xa9day'] = [track_info['date']]
+    if url:
+        tags[SOURCE_URL_TAG] = [MP4FreeForm(normalize_soundcloud_url(url).encode('utf-8'))]
+
+    if extra_tags:
+        if track_info.get('name'):
+            tags['\xa9nam'] = [track_info['name']]
+        comment = comment or (normalize_soundcloud_url(url) if url else None)
+        if comment:
+            tags['\xa9cmt'] = [comment]
+
+    if cover:
+        cover_format = MP4Cover.FORMAT_JPEG if cover.startswith(b'\xff\xd8') else MP4Cover.FORMAT_PNG
+        tags['covr'] = [MP4Cover(cover, imageformat=cover_format)]
+    return tags
+
+def build_tags(track_info, url=None):
+    return make_tags(track_info, url, fetch_cover(track_info))
+
+def apply_tags(filepath, tags):
+    from mutagen.mp4 import MP4
+
+    try:
+        audio = MP4(filepath)
+        for key, value in tags.items():
+            audio[key] = value
+        audio.save()
+
+    except Exception as e:
+        raise TagError(f"Failed to add metadata: {str(e)}") from e
+
+def add_metadata(filepath, track_info, url=None):
+    try:
+        tags = build_tags(track_info, url)
+    except Exception as e:
+        raise TagError(f"Failed to add metadata: {str(e)}") from e
+    apply_tags(filepath, tags)
@@ -0,0 +1,57 @@
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qs
+
+from .constants import LINK_EXPIRY_PARAMS, SOUNDCLOUD_RESERVED_PATHS, SOUNDCLOUD_SHORT_LINK_HOSTS
+
+URL_PATTERN = re.compile(
+    r"(?<![\w.-])(?:https?://)?(?P<host>(?:www\.|m\.|on\.)?soundcloud\.com|soundcloud\.app\.goo\.gl)"
+    r"(?P<path>/[^\s,;\"'<>?#]*)(?:[?#][^\s,;\"'<>]*)?",
+    re.IGNORECASE
+)
+SHORT_LINK_PREFIXES = tuple(f"{scheme}://{host}/" for scheme in ("https", "http")
+                            for host in SOUNDCLOUD_SHORT_LINK_HOSTS)
+
+def normalize_soundcloud_url(url):
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(("https", host, path, "", ""))
+
+def extract_soundcloud_urls(text):
+    urls = []
+    for match in URL_PATTERN.finditer(text):
+        host = match.group('host').lower()
+        if host.startswith(("www.", "m.")):
+            host = host.split(".", 1)[1]
+        path = match.group('path').rstrip("/.)]!?")
+        if path:
+            urls.append(f"https://{host}{path}")
+    return urls
+
+def is_short_link(url):
+    return url.lower().startswith(SHORT_LINK_PREFIXES)
+
+def get_link_expiry(url):
+    query = parse_qs(urlsplit(url).query)
+    for key, values in query.items():
+        if key.lower() in LINK_EXPIRY_PARAMS and values and values[0].isdigit():
+            timestamp = int(values[0])
+            if timestamp > 1000000000:
+                return timestamp
+    return None
+
+def get_collection_kind(url):
+    url = urlsplit(normalize_soundcloud_url(url))
+    if url.netloc != "soundcloud.com":
+        return None
+    parts = [part for part in url.path.split('/') if part]
+    if not parts or parts[0] in SOUNDCLOUD_RESERVED_PATHS:
+        return None
+    if len(parts) == 3 and parts[1] == "sets":
+        return "playlist"
+    if len(parts) == 1 or (len(parts) == 2 and parts[1] == "tracks"):
+        return "user"
+    return None
@@ -0,0 +1,178 @@
+import os
+import struct
+import hashlib
+
+from .constants import HASH_PIECE_SIZE, MP4_REQUIRED_ATOMS
+
+class VerifyError(Exception):
+    pass
+
+class PieceHasher:
+    def __init__(self, offset=0, on_piece=None, start=0, end=None):
+        if offset > start and (end is None or offset < end) and (offset - start) % HASH_PIECE_SIZE:
+            raise ValueError(f"Offset {offset} is not aligned to {HASH_PIECE_SIZE} byte pieces from {start}")
+        self.position = offset
+        self.start = start
+        self.end = end
+        self.index = max(0, offset - start) // HASH_PIECE_SIZE
+        self.on_piece = on_piece
+        self._digest = hashlib.sha256()
+        self._filled = 0
+
+    def update(self, data):
+        view = memoryview(data)
+        if self.position < self.start:
+            skip = min(len(view), self.start - self.position)
+            self.position += skip
+            view = view[skip:]
+        if self.end is not None:
+            view = view[:max(0, self.end - self.position)]
+        while view:
+            count = min(len(view), HASH_PIECE_SIZE - self._filled)
+            self._digest.update(view[:count])
+            self._filled += count
+            self.position += count
+            view = view[count:]
+            if self._filled == HASH_PIECE_SIZE or self.position == self.end:
+                self._complete()
+
+    def finish(self):
+        if self._filled:
+            self._complete()
+
+    def _complete(self):
+        if self.on_piece:
+            self.on_piece(self.index, self._digest.hexdigest())
+        self.index += 1
+        self._digest = hashlib.sha256()
+        self._filled = 0
+
+class AudioHasher:
+    def __init__(self, on_piece=None):
+        self.on_piece = on_piece
+        self.position = 0
+        self.start = None
+        self.end = None
+        self._atom = 0
+        self._header = b''
+        self._hasher = None
+
+    def update(self, data):
+        view = memoryview(data)
+        while view and self._hasher is None:
+            if self.position < self._atom:
+                skip = min(len(view), self._atom - self.position)
+                self.position += skip
+                view = view[skip:]
+                continue
+            wanted = 16 if self._header[:4] == b'\x00\x00\x00\x01' else 8
+            count = min(len(view), wanted - len(self._header))
+            self._header += bytes(view[:count])
+            self.position += count
+            view = view[count:]
+            if len(self._header) < wanted:
+                continue
+            size, name, header_size = _parse_atom_header(self._header, self._atom, None)
+            if len(self._header) < header_size:
+                continue
+            if name == 'mdat':
+                self.start = self._atom + header_size
+                self.end = self._atom + size if size else None
+                self._hasher = PieceHasher(self.start, self.on_piece, self.start, self.end)
+            elif not size:
+                raise VerifyError("Corrupt download: missing mdat atom")
+            else:
+                self._atom += size
+            self._header = b''
+        if view:
+            self._hasher.update(view)
+            self.position += len(view)
+
+    def finish(self):
+        if self._hasher is None:
+            raise VerifyError("Corrupt download: missing mdat atom")
+        self._hasher.finish()
+        if self.end is None:
+            self.end = self.position
+        return self.end - self.start
+
+def content_hash(pieces, size):
+    count = -(-size // HASH_PIECE_SIZE)
+    root = hashlib.sha256()
+    for index in range(count):
+        digest = pieces.get(index)
+        if digest is None:
+            return None
+        root.update(bytes.fromhex(digest))
+    return root.hexdigest()
+
+def _parse_atom_header(header, offset, size):
+    if len(header) < 8:
+        raise VerifyError(f"Corrupt download: truncated atom header at byte {offset}")
+    atom_size, name = struct.unpack(">I4s", header[:8])
+    header_size = 8
+    if atom_size == 1:
+        if len(header) < 16:
+            return 0, None, 16
+        atom_size = struct.unpack(">Q", header[8:16])[0]
+        header_size = 16
+    elif atom_size == 0 and size is not None:
+        atom_size = size - offset
+
+    if not all(32 <= c < 127 for c in name):
+        raise VerifyError(f"Corrupt download: invalid atom type {name!r} at byte {offset}")
+    name = name.decode('ascii')
+    if atom_size and atom_size < header_size:
+        raise VerifyError(f"Corrupt download: '{name}' atom at byte {offset} has invalid size {atom_size}")
+    if size is not None and offset + atom_size > size:
+        raise VerifyError(f"Corrupt download: '{name}' atom at byte {offset} needs "
+                          f"{offset + atom_size} bytes but the file has {size}")
+    return atom_size, name, header_size
+
+def iter_atoms(read, size):
+    offset = 0
+    while offset < size:
+        header = read(offset, min(16, size - offset))
+        atom_size, name, header_size = _parse_atom_header(header, offset, size)
+        if name is None:
+            raise VerifyError(f"Corrupt download: truncated atom header at byte {offset}")
+        yield offset, name, atom_size, header_size
+        offset += atom_size
+
+def find_audio(read, size):
+    for offset, name, atom_size, header_size in iter_atoms(read, size):
+        if name == 'mdat':
+            return offset + header_size, offset + atom_size
+    raise VerifyError("Corrupt download: missing mdat atom")
+
+def _file_reader(f):
+    def read(offset, count):
+        f.seek(offset)
+        return f.read(count)
+    return read
+
+def hash_audio(filepath):
+    pieces = {}
+    with open(filepath, 'rb') as f:
+        start, end = find_audio(_file_reader(f), os.fstat(f.fileno()).st_size)
+        hasher = PieceHasher(start, pieces.__setitem__, start, end)
+        f.seek(start)
+        position = start
+        while position < end:
+            chunk = f.read(min(HASH_PIECE_SIZE, end - position))
+            if not chunk:
+                break
+            hasher.update(chunk)
+            position += len(chunk)
+    hasher.finish()
+    return content_hash(pieces, end - start)
+
+def check_mp4(filepath, size=None):
+    size = os.path.getsize(filepath) if size is None else size
+    with open(filepath, 'rb') as f:
+        atoms = [name for _, name, _, _ in iter_atoms(_file_reader(f), size)]
+
+    missing = [name for name in MP4_REQUIRED_ATOMS if name not in atoms]
+    if missing:
+        raise VerifyError(f"Corrupt download: missing {', '.join(missing)} atom")
+    return atoms